@@ -0,0 +1,92 @@
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.synthetic import write_export
+
+from .common import SIZES, get_export_path
+
+
+class CleanData:
+    params = [SIZES]
+    param_names = ["n_rows"]
+    number = 1
+    timeout = 600
+
+    def setup_cache(self):
+        for n_rows in SIZES:
+            write_export(get_export_path(n_rows), n_rows)
+
+    def setup(self, n_rows):
+        self.reader = QuestionnaireReader(get_export_path(n_rows))
+        self.df = self.reader.raw.copy()
+        stages = self.reader.get_stages(list(self.df.columns))
+        self.stages = {stage.name: stage for stage in stages}
+
+    def run_stage(self, name: str):
+        stage = self.stages[name]
+        stage.function(self.df[list(stage.inputs)].copy())
+
+    def time_fix_height(self, n_rows):
+        self.reader.fix_height(self.df)
+
+    def time_replace_values(self, n_rows):
+        self.reader.replace_values(self.df)
+
+    def time_fix_attention_deficit(self, n_rows):
+        self.reader.fix_attention_deficit(self.df)
+
+    def time_bfi_stage(self, n_rows):
+        self.run_stage("bfi")
+
+    def time_psqi_stage(self, n_rows):
+        self.run_stage("psqi")
+
+    def time_shs_stage(self, n_rows):
+        self.run_stage("shs")
+
+    def time_clean_data(self, n_rows):
+        self.reader.clean_data(self.df)
+
+    def time_clean_data_threads(self, n_rows):
+        self.reader.workers = None
+        self.reader.clean_data(self.df)
+
+    def peakmem_clean_data(self, n_rows):
+        self.reader.clean_data(self.df)
+
+
+class MemoryUsage:
+    params = [[False, True]]
+    param_names = ["compact"]
+    n_rows = 100_000
+    timeout = 600
+
+    def setup_cache(self):
+        write_export(get_export_path(self.n_rows), self.n_rows)
+
+    def track_data_memory_usage(self, compact):
+        reader = QuestionnaireReader(
+            get_export_path(self.n_rows), compact=compact
+        )
+        return int(reader.data.memory_usage(deep=True).sum())
+
+    track_data_memory_usage.unit = "bytes"
+
+
+class ScoreStream:
+    params = [SIZES]
+    param_names = ["n_rows"]
+    number = 1
+    timeout = 600
+
+    def setup_cache(self):
+        for n_rows in SIZES:
+            write_export(get_export_path(n_rows), n_rows)
+
+    def setup(self, n_rows):
+        self.reader = QuestionnaireReader(get_export_path(n_rows))
+        self.out = get_export_path(n_rows, "-scores.parquet")
+
+    def time_score_stream(self, n_rows):
+        self.reader.score_stream(None, self.out, chunksize=10_000)
+
+    def peakmem_score_stream(self, n_rows):
+        self.reader.score_stream(None, self.out, chunksize=10_000)
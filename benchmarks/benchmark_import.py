@@ -0,0 +1,6 @@
+class Import:
+    def timeraw_import_questionnaire_reader(self):
+        return "import questionnaire_reader"
+
+    def timeraw_import_plotting(self):
+        return "import questionnaire_reader.plotting"
@@ -0,0 +1,53 @@
+import matplotlib
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.synthetic import write_export
+
+from .common import SIZES, get_export_path
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+DISTRIBUTION_COLUMNS = ["Age (years)", "Height (cm)", "SHS", "Neuroticism"]
+
+
+class Plotting:
+    params = [SIZES]
+    param_names = ["n_rows"]
+    timeout = 600
+
+    def setup_cache(self):
+        for n_rows in SIZES:
+            write_export(get_export_path(n_rows), n_rows)
+
+    def setup(self, n_rows):
+        self.reader = QuestionnaireReader(get_export_path(n_rows))
+        self.reader.compute()
+
+    def teardown(self, n_rows):
+        plt.close("all")
+
+    def time_plot_column_distribution(self, n_rows):
+        self.reader.plot_column_distribution("Age (years)")
+
+    def time_plot_distribution(self, n_rows):
+        self.reader.plot_distribution(DISTRIBUTION_COLUMNS)
+
+    def time_plot_distribution_exact_kde(self, n_rows):
+        self.reader.plot_distribution(DISTRIBUTION_COLUMNS, kde_method="exact")
+
+    def time_render_distribution(self, n_rows):
+        self.reader.plot_distribution(DISTRIBUTION_COLUMNS).canvas.draw()
+
+    def time_plot_pie_chart(self, n_rows):
+        self.reader.plot_pie_chart("Diet")
+
+    def time_plot_pie_chart_with_table(self, n_rows):
+        self.reader.plot_pie_chart_with_table("Diet")
+
+    def time_plot_bar_chart(self, n_rows):
+        self.reader.plot_bar_chart("Diet")
+
+    def peakmem_plot_distribution(self, n_rows):
+        self.reader.plot_distribution(DISTRIBUTION_COLUMNS)
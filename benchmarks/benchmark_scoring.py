@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.bfi import calculate_bfi_scores
+from questionnaire_reader.psqi import REPLACE_DICT as PSQI_REPLACE_DICT
+from questionnaire_reader.psqi import (
+    calculate_component_4,
+    calculate_psqi_scores,
+    convert_df,
+)
+from questionnaire_reader.shs import calculate_shs
+from questionnaire_reader.submission import SubmissionScorer
+from questionnaire_reader.synthetic import generate_responses
+from questionnaire_reader.utils.freedman_diaconis import (
+    freedman_diaconis,
+    freedman_diaconis_chunked,
+)
+
+from .common import LARGE_SIZES, SIZES
+
+
+class Scoring:
+    params = [SIZES]
+    param_names = ["n_rows"]
+    timeout = 600
+
+    def setup(self, n_rows):
+        df = generate_responses(n_rows)
+        # The reader is only used for its column selection helpers.
+        reader = QuestionnaireReader(path="")
+        self.bfi = reader.get_bfi_responses(df)
+        self.psqi = reader.get_psqi_responses(df)
+        self.shs = df
+        self.values = np.random.default_rng(0).normal(size=n_rows)
+
+    def time_calculate_bfi_scores(self, n_rows):
+        calculate_bfi_scores(self.bfi)
+
+    def time_convert_psqi_df(self, n_rows):
+        convert_df(self.psqi)
+
+    def time_calculate_psqi_component_4(self, n_rows):
+        calculate_component_4(self.psqi[["Q_4", "Q_3", "Q_1"]])
+
+    def time_calculate_psqi_scores(self, n_rows):
+        calculate_psqi_scores(self.psqi)
+
+    def time_calculate_shs(self, n_rows):
+        calculate_shs(self.shs)
+
+    def time_freedman_diaconis(self, n_rows):
+        freedman_diaconis(self.values)
+
+    def time_freedman_diaconis_chunked(self, n_rows):
+        freedman_diaconis_chunked(np.array_split(self.values, 10))
+
+    def peakmem_calculate_psqi_scores(self, n_rows):
+        calculate_psqi_scores(self.psqi)
+
+
+def convert_df_row_loop(psqi_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The row-by-row binning :func:`convert_df` replaced, kept as a baseline.
+    """
+    psqi_df = psqi_df.replace(PSQI_REPLACE_DICT)
+    for ind_name in psqi_df.index:
+        q2 = psqi_df.loc[ind_name, "Q_2"]
+        q4 = psqi_df.loc[ind_name, "Q_4"]
+        if q2 <= 15:
+            psqi_df.loc[ind_name, "Q_2"] = 0
+        elif q2 <= 30:
+            psqi_df.loc[ind_name, "Q_2"] = 1
+        elif q2 <= 60:
+            psqi_df.loc[ind_name, "Q_2"] = 2
+        else:
+            psqi_df.loc[ind_name, "Q_2"] = 3
+        if q4 > 7:
+            psqi_df.loc[ind_name, "Q_4"] = 0
+        elif q4 >= 6:
+            psqi_df.loc[ind_name, "Q_4"] = 1
+        elif q4 >= 5:
+            psqi_df.loc[ind_name, "Q_4"] = 2
+        else:
+            psqi_df.loc[ind_name, "Q_4"] = 3
+    return psqi_df
+
+
+def get_psqi_responses(n_rows: int) -> pd.DataFrame:
+    # Larger sizes repeat a 100k rows sample, which is slow to generate.
+    sample = generate_responses(min(n_rows, 100_000))
+    psqi = QuestionnaireReader(path="").get_psqi_responses(sample)
+    repeats = -(-n_rows // len(psqi))
+    return pd.concat([psqi] * repeats, ignore_index=True).iloc[:n_rows]
+
+
+class ConvertPsqi:
+    params = [LARGE_SIZES]
+    param_names = ["n_rows"]
+    number = 1
+    timeout = 600
+
+    def setup(self, n_rows):
+        self.psqi = get_psqi_responses(n_rows)
+
+    def time_convert_df(self, n_rows):
+        convert_df(self.psqi)
+
+
+class ConvertPsqiRowLoop:
+    # The row loop takes minutes at 1M rows, so it stops at 100k.
+    params = [LARGE_SIZES[:2]]
+    param_names = ["n_rows"]
+    number = 1
+    timeout = 600
+
+    def setup(self, n_rows):
+        self.psqi = get_psqi_responses(n_rows)
+
+    def time_convert_df_row_loop(self, n_rows):
+        convert_df_row_loop(self.psqi)
+
+
+class SubmissionScoring:
+    def setup(self):
+        self.scorer = SubmissionScorer()
+        self.record = generate_responses(1).to_dict("records")[0]
+
+    def time_score_submission(self):
+        self.scorer.score(self.record)
+
+    def time_clean_data_single_row(self):
+        # Baseline: the batch pipeline on a one-row data frame.
+        QuestionnaireReader(path="").clean_data(pd.DataFrame([self.record]))
@@ -0,0 +1,9 @@
+import os
+
+SIZES = [1_000, 10_000, 100_000]
+# Sizes for the column-wise PSQI binning, which should scale to 1M rows.
+LARGE_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def get_export_path(n_rows: int, extension: str = ".csv") -> str:
+    return os.path.abspath(f"questionnaire_{n_rows}{extension}")
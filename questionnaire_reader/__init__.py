@@ -1 +1,2 @@
 from questionnaire_reader.questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.collection import QuestionnaireCollection
@@ -0,0 +1,105 @@
+"""
+Asynchronous loading, for embedding readers in asyncio services.
+"""
+
+import asyncio
+import io
+from concurrent.futures import Executor
+from urllib.request import urlopen
+
+from questionnaire_reader.readers import DOWNLOAD_TIMEOUT, is_url
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+
+async def fetch(
+    url: str,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    timeout: float = DOWNLOAD_TIMEOUT,
+) -> io.BytesIO:
+    """
+    Download *url* into memory without blocking the event loop.
+
+    The response is read in chunks of *chunk_size* bytes in the loop's
+    default executor, so that a cancelled download stops after the chunk
+    being read.
+
+    Parameters
+    ----------
+    url : str
+        http(s) URL
+    chunk_size : int, optional
+        Number of bytes read at a time, by default 1 MiB
+    timeout : float, optional
+        Socket timeout in seconds, by default 60, so that a stalled server
+        does not hold an executor thread forever; None uses the global
+        default
+
+    Returns
+    -------
+    io.BytesIO
+        Downloaded contents, rewound
+    """
+    loop = asyncio.get_running_loop()
+    kwargs = {} if timeout is None else {"timeout": timeout}
+    response = await loop.run_in_executor(None, lambda: urlopen(url, **kwargs))
+    buffer = io.BytesIO()
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, response.read, chunk_size)
+            if not chunk:
+                break
+            buffer.write(chunk)
+    except BaseException:
+        # A cancelled read may still be running in the executor, and closing
+        # the response waits for it, so that must not happen on the loop.
+        loop.run_in_executor(None, response.close)
+        raise
+    response.close()
+    buffer.seek(0)
+    return buffer
+
+
+def load_reader(reader, source=None):
+    """
+    Read and clean *reader*'s export (from *source*, if given) and return
+    the reader, so that process pool executors can send it back loaded.
+    """
+    reader.load(source)
+    reader.compute()
+    return reader
+
+
+async def aload(
+    reader, executor: Executor = None, timeout: float = DOWNLOAD_TIMEOUT
+):
+    """
+    Load and clean a :class:`~questionnaire_reader.QuestionnaireReader`'s
+    export without blocking the event loop.
+
+    http(s) exports are downloaded with :func:`fetch`; reading and cleaning
+    run in *executor*. Cancelling the returned coroutine stops a download
+    after its current chunk (or *timeout*); a read or clean already running
+    in *executor* finishes in the background, and its result is discarded.
+
+    Parameters
+    ----------
+    reader : QuestionnaireReader
+        Reader to load
+    executor : Executor, optional
+        Executor reading and cleaning the export, by default the event
+        loop's default (thread pool) executor; with a process pool, the
+        reader is sent to a worker process and a loaded copy is returned
+    timeout : float, optional
+        Download socket timeout in seconds (see :func:`fetch`)
+
+    Returns
+    -------
+    QuestionnaireReader
+        Loaded reader
+    """
+    loop = asyncio.get_running_loop()
+    source = None
+    if is_url(reader.path):
+        source = await fetch(reader.path, timeout=timeout)
+    return await loop.run_in_executor(executor, load_reader, reader, source)
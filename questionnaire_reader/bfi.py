@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 from enum import Enum
@@ -26,6 +27,8 @@ REPLACE_DICT = {
     "מסכים": 4,
     "מסכים בהחלט": 5,
 }
+N_QUESTIONS = 44
+REVERSED_MASK = np.isin(np.arange(N_QUESTIONS), REVERSED_SCORING)
 
 
 def calculate_bfi(data: pd.Series) -> pd.Series:
@@ -38,3 +41,39 @@ def calculate_bfi(data: pd.Series) -> pd.Series:
         responses.update(reverse)
         scores[trait.value] = responses.mean()
     return pd.Series(scores)
+
+
+def get_response_values(responses: pd.Series) -> np.ndarray:
+    codes, uniques = pd.factorize(responses)
+    values = np.array(
+        [REPLACE_DICT.get(unique, unique) for unique in uniques] + [np.nan],
+        dtype=float,
+    )
+    return values[codes]
+
+
+def calculate_bfi_scores(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate BFI trait scores for all subjects at once.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Subjects' BFI responses, one column per question in questionnaire
+        order
+
+    Returns
+    -------
+    pd.DataFrame
+        Trait scores, one column per trait, indexed like *data*
+    """
+    responses = np.column_stack(
+        [get_response_values(column) for _, column in data.items()]
+    )
+    responses[:, REVERSED_MASK] = 6 - responses[:, REVERSED_MASK]
+    responses = pd.DataFrame(responses, index=data.index)
+    scores = {
+        trait.value: responses[BFI_QUESTIONS[trait]].mean(axis=1)
+        for trait in BFI
+    }
+    return pd.DataFrame(scores, index=data.index)
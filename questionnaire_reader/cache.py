@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from questionnaire_reader.version import __version__
+
+CHUNK_SIZE = 1 << 20
+ENTRY_TABLES = ("raw", "data", "unseen_responses", "invalid_sleep_times")
+UNSEEN_COLUMNS = ["column", "response", "count"]
+
+
+class CacheEntry(NamedTuple):
+    """
+    A cleaned dataset, with the raw dataset it was cleaned from and the
+    diagnostics recorded while cleaning it.
+    """
+
+    raw: pd.DataFrame
+    data: pd.DataFrame
+    unseen_responses: dict
+    invalid_sleep_times: pd.Series
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_configuration(**configuration) -> str:
+    serialized = json.dumps(
+        configuration, sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def hash_rows(df: pd.DataFrame) -> pd.Series:
+    """
+    Fingerprint each row of *df* by its values (but not its index label).
+    """
+    return pd.util.hash_pandas_object(df, index=False)
+
+
+def get_cache_key(path: str, **configuration) -> Optional[str]:
+    """
+    Return the key identifying a cleaned dataset in the cache.
+
+    Parameters
+    ----------
+    path : str
+        Source file path
+    configuration
+        Any reader configuration affecting the cleaned dataset
+
+    Returns
+    -------
+    Optional[str]
+        Cache key, or None if *path* is not a local file
+    """
+    if not isinstance(path, (str, os.PathLike)) or not os.path.isfile(path):
+        return None
+    file_hash = hash_file(path)
+    configuration_hash = hash_configuration(
+        version=__version__, **configuration
+    )
+    return f"{file_hash[:32]}-{configuration_hash[:32]}"
+
+
+def get_cache_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, key)
+
+
+def get_table_path(entry_path: str, name: str) -> str:
+    return os.path.join(entry_path, name + ".parquet")
+
+
+def to_storable(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast object columns mixing value types (which Parquet cannot store) to
+    strings.
+    """
+    mixed = [
+        name
+        for name, column in df.items()
+        if column.dtype == object
+        and pd.api.types.infer_dtype(column, skipna=True).startswith("mixed")
+    ]
+    if not mixed:
+        return df
+    return df.astype({name: "str" for name in mixed})
+
+
+def flatten_unseen_responses(unseen_responses: dict) -> pd.DataFrame:
+    frames = [
+        pd.DataFrame(
+            {"column": key, "response": unseen.index, "count": unseen.values}
+        )
+        for key, unseen in unseen_responses.items()
+    ]
+    if not frames:
+        return pd.DataFrame(columns=UNSEEN_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def nest_unseen_responses(flat: pd.DataFrame) -> dict:
+    return {
+        key: pd.Series(
+            group["count"].to_numpy(),
+            index=pd.Index(group["response"].to_numpy(), dtype=object),
+        )
+        for key, group in flat.groupby("column", sort=False)
+    }
+
+
+def read_cache(cache_dir: str, key: str) -> Optional[CacheEntry]:
+    """
+    Read the entry stored under *key*.
+
+    Entries are stored as Parquet files rather than pickles, so that reading
+    a cache directory shared with others cannot execute arbitrary code.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Cache directory
+    key : str
+        Cache key, as returned by :func:`get_cache_key`
+
+    Returns
+    -------
+    Optional[CacheEntry]
+        Cached entry, or None if there is no usable entry
+    """
+    entry_path = get_cache_path(cache_dir, key)
+    if not os.path.isdir(entry_path):
+        return None
+    try:
+        raw, data, unseen, invalid = (
+            pd.read_parquet(get_table_path(entry_path, name))
+            for name in ENTRY_TABLES
+        )
+        return CacheEntry(
+            raw,
+            data,
+            nest_unseen_responses(unseen),
+            invalid["invalid_sleep_times"].rename(None),
+        )
+    except Exception:
+        # Unreadable or incomplete entries are discarded and rebuilt.
+        shutil.rmtree(entry_path, ignore_errors=True)
+        return None
+
+
+def write_cache(
+    cache_dir: str,
+    key: str,
+    raw: pd.DataFrame,
+    data: pd.DataFrame,
+    unseen_responses: dict = None,
+    invalid_sleep_times: pd.Series = None,
+) -> None:
+    """
+    Store a cleaned dataset under *key*.
+
+    The entry is written to a temporary directory and then moved into place,
+    so concurrent readers never see a partially written entry. Object
+    columns mixing value types (including unseen responses) are stored as
+    strings.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Cache directory
+    key : str
+        Cache key, as returned by :func:`get_cache_key`
+    raw : pd.DataFrame
+        Raw dataset
+    data : pd.DataFrame
+        Clean dataset
+    unseen_responses : dict, optional
+        Counts of unknown responses by column, by default none
+    invalid_sleep_times : pd.Series, optional
+        Mask of responses without sleep efficiency, by default none
+    """
+    if invalid_sleep_times is None:
+        invalid_sleep_times = pd.Series(dtype=bool)
+    tables = (
+        raw,
+        data,
+        flatten_unseen_responses(unseen_responses or {}),
+        invalid_sleep_times.rename("invalid_sleep_times").to_frame(),
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary_path = tempfile.mkdtemp(dir=cache_dir, suffix=".tmp")
+    try:
+        for name, df in zip(ENTRY_TABLES, tables):
+            to_storable(df).to_parquet(get_table_path(temporary_path, name))
+        entry_path = get_cache_path(cache_dir, key)
+        try:
+            os.replace(temporary_path, entry_path)
+        except OSError:
+            # Another process stored the same entry first.
+            if not os.path.isdir(entry_path):
+                raise
+            shutil.rmtree(temporary_path)
+    except BaseException:
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        raise
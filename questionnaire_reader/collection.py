@@ -0,0 +1,112 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Tuple, Union
+
+import pandas as pd
+
+from questionnaire_reader.questionnaire_reader import QuestionnaireReader
+
+
+def read_questionnaire(path, **kwargs) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    reader = QuestionnaireReader(path, **kwargs)
+    return reader.raw, reader.data
+
+
+class QuestionnaireCollection:
+    """
+    Reads and cleans many questionnaire exports (e.g. from several sites or
+    waves) in parallel, and concatenates them.
+
+    Parameters
+    ----------
+    paths : Union[list, dict]
+        Export paths, or a dictionary of export paths by source key
+    workers : int, optional
+        Number of worker processes, by default the number of CPUs; 1 reads
+        the exports in the current process
+    key_name : str, optional
+        Name of the index level identifying each row's source
+    kwargs
+        Passed to each :class:`QuestionnaireReader`
+    """
+
+    def __init__(
+        self,
+        paths: Union[list, dict],
+        workers: int = None,
+        key_name: str = "Source",
+        **kwargs,
+    ):
+        self.paths = (
+            paths if isinstance(paths, dict) else {p: p for p in paths}
+        )
+        self.workers = workers
+        self.key_name = key_name
+        self.kwargs = kwargs
+        self.errors: Dict[str, Exception] = {}
+        self._raw = None
+        self._data = None
+
+    @property
+    def raw(self) -> pd.DataFrame:
+        if self._raw is None:
+            self.compute()
+        return self._raw
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            self.compute()
+        return self._data
+
+    def read_all(self) -> Dict[str, Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Read and clean every export, recording failures in :attr:`errors`
+        rather than raising.
+
+        Returns
+        -------
+        Dict[str, Tuple[pd.DataFrame, pd.DataFrame]]
+            Raw and clean datasets by source key
+        """
+        results = {}
+        self.errors = {}
+        if self.workers == 1:
+            for key, path in self.paths.items():
+                try:
+                    results[key] = read_questionnaire(path, **self.kwargs)
+                except Exception as exception:
+                    self.errors[key] = exception
+            return results
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                key: executor.submit(read_questionnaire, path, **self.kwargs)
+                for key, path in self.paths.items()
+            }
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as exception:
+                    self.errors[key] = exception
+        return results
+
+    def compute(self) -> pd.DataFrame:
+        """
+        Read all exports and concatenate them, with the source key as the
+        outer index level.
+
+        Returns
+        -------
+        pd.DataFrame
+            Clean dataset
+        """
+        results = self.read_all()
+        names = [self.key_name, None]
+        if results:
+            raw = {key: result[0] for key, result in results.items()}
+            data = {key: result[1] for key, result in results.items()}
+            self._raw = pd.concat(raw, names=names)
+            self._data = pd.concat(data, names=names)
+        else:
+            self._raw = pd.DataFrame()
+            self._data = pd.DataFrame()
+        return self._data
@@ -342,6 +342,9 @@ NAMES = (
     "Can we contact you again?",
     "Will you consider being scanned again?",
 )
+PSQI_START = NAMES.index("Bedtime")
+PSQI_END = NAMES.index("Other Sleeping Problems Frequency") + 1
+PSQI_NAMES = NAMES[PSQI_START:PSQI_END]
 REPLACE_DICT = {
     "Dominant Hand": {
         "ימין": "Right",
@@ -0,0 +1,146 @@
+"""
+Batch export of figures, rendered headlessly in worker processes.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, NamedTuple, Sequence, Union
+
+import pandas as pd
+
+from questionnaire_reader.plotting import PlottingMixin
+
+UNSAFE_CHARACTERS = re.compile(r"[^\w.\- ]+")
+
+
+class FigureSpec(NamedTuple):
+    """
+    A figure to export: the plotting method (without its "plot_" prefix),
+    the column or columns it plots, extra keyword arguments to the method
+    and, optionally, the output file name (without extension).
+    """
+
+    kind: str
+    columns: Union[str, Sequence[str]]
+    options: dict = {}
+    name: str = None
+
+    def get_column_names(self) -> list:
+        if isinstance(self.columns, str):
+            return [self.columns]
+        return list(self.columns)
+
+    def get_file_name(self, file_format: str) -> str:
+        name = self.name
+        if name is None:
+            name = "-".join([self.kind] + self.get_column_names())
+        return f"{UNSAFE_CHARACTERS.sub('_', name)}.{file_format}"
+
+
+class FramePlotter(PlottingMixin):
+    """
+    Exposes :class:`~questionnaire_reader.plotting.PlottingMixin`'s methods
+    over a given (partial) clean dataset.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+
+
+def use_agg_backend() -> None:
+    import matplotlib.pyplot as plt
+
+    plt.switch_backend("Agg")
+
+
+def render_figure(
+    spec: FigureSpec, data: pd.DataFrame, path: str, **savefig_kwargs
+) -> str:
+    """
+    Draw *spec* over *data* and save it to *path*, closing every figure
+    afterwards.
+    """
+    import matplotlib.pyplot as plt
+
+    plt.close("all")
+    try:
+        plot = getattr(FramePlotter(data), f"plot_{spec.kind}")
+        columns = spec.get_column_names()
+        if spec.kind == "distribution":
+            plot(columns, **spec.options)
+        else:
+            plot(*columns, **spec.options)
+        plt.gcf().savefig(path, **savefig_kwargs)
+    finally:
+        plt.close("all")
+    return path
+
+
+def export_figures(
+    data: pd.DataFrame,
+    spec: Iterable[Union[FigureSpec, tuple]],
+    out_dir: str,
+    workers: int = None,
+    fmt: str = "png",
+    **savefig_kwargs,
+) -> list:
+    """
+    Render figures of *data* with matplotlib's non-interactive Agg backend
+    in a process pool, and save them to *out_dir*.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Clean dataset
+    spec : Iterable[Union[FigureSpec, tuple]]
+        Figures to export, as :class:`FigureSpec` instances or tuples of
+        their fields
+    out_dir : str
+        Output directory, created if missing
+    workers : int, optional
+        Number of worker processes, by default the number of CPUs; 1
+        renders the figures in the current process, with its current
+        backend
+    fmt : str, optional
+        Output format, by default "png"
+    savefig_kwargs
+        Passed to :meth:`matplotlib.figure.Figure.savefig`
+
+    Returns
+    -------
+    list
+        Paths of the exported figures, in *spec* order
+    """
+    specs = [
+        entry if isinstance(entry, FigureSpec) else FigureSpec(*entry)
+        for entry in spec
+    ]
+    unknown = {
+        entry.kind
+        for entry in specs
+        if not hasattr(FramePlotter, f"plot_{entry.kind}")
+    }
+    if unknown:
+        raise ValueError(f"Unknown figure kinds: {sorted(unknown)}")
+    os.makedirs(out_dir, exist_ok=True)
+    savefig_kwargs["format"] = fmt
+    jobs = [
+        (
+            entry,
+            # Workers only receive the columns their figure plots.
+            data[entry.get_column_names()],
+            os.path.join(out_dir, entry.get_file_name(fmt)),
+        )
+        for entry in specs
+    ]
+    if workers == 1:
+        return [render_figure(*job, **savefig_kwargs) for job in jobs]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=use_agg_backend
+    ) as executor:
+        futures = [
+            executor.submit(render_figure, *job, **savefig_kwargs)
+            for job in jobs
+        ]
+        return [future.result() for future in futures]
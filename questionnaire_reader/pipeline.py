@@ -0,0 +1,188 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+import pandas as pd
+
+from questionnaire_reader.profiling import Profiler
+
+
+class Stage(NamedTuple):
+    """
+    A cleaning or scoring step, declaring the columns it reads, writes and
+    removes.
+
+    *function* is called with a frame holding only the *inputs* columns and
+    returns a frame (or a named series) holding the *outputs* columns, which
+    may overwrite existing columns or add new ones. A *columnwise* stage
+    transforms each of its columns independently of the others, so that
+    producing some of its outputs only requires the same input columns.
+    """
+
+    name: str
+    function: Callable[[pd.DataFrame], pd.DataFrame]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    drops: Tuple[str, ...] = ()
+    columnwise: bool = False
+
+
+def in_place(function: Callable[[pd.DataFrame], None]) -> Callable:
+    """
+    Adapt a function modifying a frame in place to the :class:`Stage`
+    calling convention.
+    """
+
+    def wrapper(df: pd.DataFrame) -> pd.DataFrame:
+        function(df)
+        return df
+
+    return wrapper
+
+
+def depends_on(stage: Stage, other: Stage) -> bool:
+    """
+    Whether *stage* must run after the earlier stage *other*: because it
+    reads what *other* writes or removes, or writes or removes what *other*
+    reads or writes.
+    """
+    written = set(other.outputs) | set(other.drops)
+    touched = set(stage.outputs) | set(stage.drops)
+    return bool(
+        written.intersection(stage.inputs)
+        or touched.intersection(other.inputs)
+        or touched.intersection(written)
+    )
+
+
+def get_dependencies(stages: Sequence[Stage]) -> List[set]:
+    return [
+        {j for j in range(i) if depends_on(stage, stages[j])}
+        for i, stage in enumerate(stages)
+    ]
+
+
+def select_stages(stages: Sequence[Stage], outputs: Sequence[str]) -> list:
+    """
+    Select the stages needed to produce *outputs*, in registration order.
+    Columnwise stages are narrowed to the columns needed.
+    """
+    needed = set(outputs)
+    selected = []
+    for stage in reversed(stages):
+        produced = needed.intersection(stage.outputs)
+        if not produced:
+            continue
+        if stage.columnwise:
+            columns = tuple(name for name in stage.outputs if name in produced)
+            stage = stage._replace(inputs=columns, outputs=columns)
+        needed.update(stage.inputs)
+        selected.append(stage)
+    return selected[::-1]
+
+
+def get_source_columns(stages: Sequence[Stage], outputs: Sequence[str]) -> set:
+    """
+    Find the input columns needed to produce *outputs*.
+    """
+    needed = set(outputs)
+    for stage in reversed(stages):
+        produced = needed.intersection(stage.outputs)
+        if produced:
+            needed.difference_update(produced)
+            needed.update(produced if stage.columnwise else stage.inputs)
+    return needed
+
+
+def run_stage(stage: Stage, inputs: pd.DataFrame, profiler: Profiler):
+    with profiler.stage(stage.name, len(inputs)):
+        result = stage.function(inputs)
+    if isinstance(result, pd.Series):
+        result = result.to_frame()
+    return result[list(stage.outputs)]
+
+
+def run_pipeline(
+    df: pd.DataFrame,
+    stages: Sequence[Stage],
+    outputs: Sequence[str] = None,
+    workers: int = 1,
+    profiler: Profiler = None,
+) -> pd.DataFrame:
+    """
+    Run *stages* over *df*, running stages that do not depend on one another
+    concurrently, and assemble the result with a single column merge.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Input dataset, which is left unchanged
+    stages : Sequence[Stage]
+        Stages, in the order they would run sequentially
+    outputs : Sequence[str], optional
+        Columns to return, by default all columns; stages that do not
+        contribute to them are skipped
+    workers : int, optional
+        Number of worker threads, by default 1, which runs the stages in the
+        current thread; None lets
+        :class:`~concurrent.futures.ThreadPoolExecutor` choose. The scorers
+        mostly hold the GIL, so threads rarely shorten a run
+    profiler : Profiler, optional
+        Profiler recording each stage
+
+    Returns
+    -------
+    pd.DataFrame
+        Resulting dataset, indexed like *df*
+    """
+    profiler = Profiler() if profiler is None else profiler
+    if outputs is not None:
+        stages = select_stages(stages, outputs)
+    dependencies = get_dependencies(stages)
+    columns: Dict[str, pd.Series] = dict(df.items())
+    dropped = set()
+
+    def get_inputs(stage: Stage) -> pd.DataFrame:
+        return pd.DataFrame(
+            {name: columns[name] for name in stage.inputs}, index=df.index
+        )
+
+    def merge(stage: Stage, result: pd.DataFrame) -> None:
+        for name in stage.drops:
+            columns.pop(name, None)
+            dropped.add(name)
+        for name, column in result.items():
+            columns[name] = column
+            dropped.discard(name)
+
+    if workers == 1:
+        for stage in stages:
+            merge(stage, run_stage(stage, get_inputs(stage), profiler))
+    else:
+        done = set()
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while len(done) < len(stages):
+                for i, stage in enumerate(stages):
+                    ready = dependencies[i] <= done
+                    if ready and i not in done and i not in running.values():
+                        future = executor.submit(
+                            run_stage, stage, get_inputs(stage), profiler
+                        )
+                        running[future] = i
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    merge(stages[i], future.result())
+                    done.add(i)
+    if outputs is None:
+        names = [name for name in df.columns if name not in dropped]
+        # New columns follow stage order, whichever stage finished first.
+        for stage in stages:
+            names += [
+                name
+                for name in stage.outputs
+                if name in columns and name not in names
+            ]
+    else:
+        names = list(outputs)
+    return pd.concat([columns[name] for name in names], axis=1, keys=names)
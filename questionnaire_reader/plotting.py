@@ -0,0 +1,392 @@
+from typing import TYPE_CHECKING, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from questionnaire_reader.utils.aggregates import AggregateCache
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+EXTRA_COLORS = ["lightsalmon", "greenyellow", "hotpink", "darkviolet"]
+# Options of pandas' and matplotlib's hist that Axes.stairs does not take;
+# histograms drawn with any of them fall back to DataFrame.hist.
+HIST_ONLY_OPTIONS = frozenset(
+    (
+        "by",
+        "histtype",
+        "align",
+        "orientation",
+        "rwidth",
+        "log",
+        "stacked",
+        "bottom",
+        "xlabelsize",
+        "xrot",
+        "ylabelsize",
+        "yrot",
+        "sharex",
+        "sharey",
+        "layout",
+        "legend",
+    )
+)
+
+
+def get_default_colors() -> list:
+    import matplotlib.pyplot as plt
+
+    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    return colors + EXTRA_COLORS
+
+
+def get_histogram(
+    values: np.ndarray,
+    bins,
+    range: tuple = None,
+    weights: np.ndarray = None,
+    density: bool = False,
+    cumulative: Union[bool, int] = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Histogram counts and edges, with the binning options of
+    :meth:`matplotlib.axes.Axes.hist`; a negative *cumulative* accumulates
+    from the last bin.
+    """
+    counts, edges = np.histogram(
+        values, bins=bins, range=range, weights=weights, density=density
+    )
+    if cumulative:
+        if density:
+            counts = counts * np.diff(edges)
+        if cumulative < 0:
+            counts = np.cumsum(counts[::-1])[::-1]
+        else:
+            counts = np.cumsum(counts)
+    return counts, edges
+
+
+def get_values(column: pd.Series) -> np.ndarray:
+    values = pd.to_numeric(column, errors="coerce").to_numpy(dtype=float)
+    return values[~np.isnan(values)]
+
+
+def get_shared_bins(columns: list) -> np.ndarray:
+    """
+    Histogram bin edges shared by several columns, spanning all of them with
+    the median of their Freedman-Diaconis bin widths.
+    """
+    from questionnaire_reader.utils.freedman_diaconis import freedman_diaconis
+
+    lows, highs, widths = [], [], []
+    for values in columns:
+        if values.size < 2 or values.min() == values.max():
+            continue
+        lows.append(values.min())
+        highs.append(values.max())
+        widths.append((highs[-1] - lows[-1]) / freedman_diaconis(values))
+    if not widths:
+        return None
+    low, high = min(lows), max(highs)
+    n_bins = int(np.ceil((high - low) / np.median(widths)))
+    return np.linspace(low, high, n_bins + 1)
+
+
+class PlottingMixin:
+    """
+    Plotting methods for :class:`~questionnaire_reader.QuestionnaireReader`.
+
+    matplotlib (and scipy, for exact KDEs) are only imported once a plot is
+    drawn, so that reading and scoring questionnaires does not depend on
+    them.
+    """
+
+    @property
+    def aggregates(self) -> AggregateCache:
+        """
+        Per-column aggregates of :attr:`data`, computed once and reused
+        across plots until :attr:`data` is replaced.
+        """
+        if getattr(self, "_aggregates", None) is None:
+            self._aggregates = AggregateCache()
+        return self._aggregates.bind(self.data)
+
+    def export_figures(
+        self,
+        spec: list,
+        out_dir: str,
+        workers: int = None,
+        fmt: str = "png",
+        **savefig_kwargs,
+    ) -> list:
+        """
+        Render figures headlessly in a process pool and save them to
+        *out_dir*; see :func:`questionnaire_reader.figures.export_figures`.
+        """
+        from questionnaire_reader.figures import export_figures
+
+        return export_figures(
+            self.data,
+            spec,
+            out_dir,
+            workers=workers,
+            fmt=fmt,
+            **savefig_kwargs,
+        )
+
+    def fix_colors(
+        self, value_counts: pd.Series, colors: list, by_index: bool = False
+    ):
+        if "N/A" in value_counts.index:
+            colors[value_counts.index.get_loc("N/A")] = "lightgrey"
+        if by_index:
+            colors = [
+                color for _, color in sorted(zip(value_counts.index, colors))
+            ]
+        return colors
+
+    def plot_column_distribution(
+        self,
+        column_name: str,
+        axes: "plt.Axes" = None,
+        title: str = None,
+        x_label: str = None,
+        y_label: str = None,
+        x_range: tuple = None,
+        y_range: tuple = None,
+        n_bins: Union[int, np.ndarray] = None,
+        kde: bool = True,
+        kde_method: str = "fft",
+        kde_points: int = 1000,
+        **kwargs,
+    ):
+        """
+        Plot a column's histogram and, optionally, its kernel density
+        estimate.
+
+        Parameters
+        ----------
+        column_name : str
+            Column to plot
+        n_bins : Union[int, np.ndarray], optional
+            Number of bins or bin edges, by default the Freedman-Diaconis
+            bin count
+        kde : bool, optional
+            Whether to plot a KDE, by default True
+        kde_method : str, optional
+            "fft" for a binned estimate whose cost barely grows with the
+            number of subjects, or "exact" for pandas' exact Gaussian KDE
+        kde_points : int, optional
+            Number of points the binned KDE is evaluated at
+        kwargs
+            Binning options of :meth:`matplotlib.axes.Axes.hist` ("range",
+            "weights", "density" and "cumulative") and artist properties
+            passed to :meth:`matplotlib.axes.Axes.stairs`; with any other
+            :meth:`pandas.DataFrame.hist` option (e.g. "by", "histtype" or
+            "log"), the histogram is drawn by that method instead
+        """
+        import matplotlib.pyplot as plt
+
+        from questionnaire_reader.utils.freedman_diaconis import (
+            freedman_diaconis,
+        )
+
+        column = self.data[column_name].dropna()
+        if axes is None:
+            _, axes = plt.subplots(figsize=kwargs.get("figsize"))
+
+        # Plot histogram
+        values = get_values(column)
+        if n_bins is None:
+            n_bins = freedman_diaconis(values)
+        DEFAULTS = {
+            "bins": n_bins,
+            "color": "blue",
+            "grid": False,
+        }
+        configuration = {**DEFAULTS, **kwargs}
+        if HIST_ONLY_OPTIONS.intersection(configuration):
+            self.data.hist(column=column_name, ax=axes, **configuration)
+        else:
+            # Count once and draw the counts as a single artist, so that
+            # rendering does not grow with the number of subjects or bins.
+            options = dict(configuration)
+            options.pop("figsize", None)
+            grid = options.pop("grid")
+            counts, edges = get_histogram(
+                values,
+                options.pop("bins"),
+                range=options.pop("range", None),
+                weights=options.pop("weights", None),
+                density=options.pop("density", False),
+                cumulative=options.pop("cumulative", False),
+            )
+            axes.stairs(counts, edges, fill=True, **options)
+            axes.grid(grid)
+
+        # Set title
+        axes.set_title(title or f"{column_name} Distribution")
+
+        # Set axis labels
+        axes.set_xlabel(x_label or column_name)
+        if y_label is None:
+            if configuration.get("density"):
+                y_label = "Probability Density"
+            else:
+                y_label = "Number of Observations"
+        axes.set_ylabel(y_label)
+
+        # Set axis ranges
+        if x_range:
+            axes.set_xlim(x_range)
+        if y_range:
+            axes.set_ylim(y_range)
+
+        # Plot KDE
+        if kde and not configuration.get("by"):
+            axes_2 = axes.twinx()
+            if kde_method == "exact":
+                column.plot.kde(ax=axes_2, color="red", legend=False)
+            else:
+                from questionnaire_reader.utils.kde import fft_kde
+
+                grid, density = fft_kde(values, n_points=kde_points)
+                axes_2.plot(grid, density, color="red")
+            axes_2.set_ylabel("KDE")
+            axes_2.set_ylim(0)
+        return axes
+
+    def plot_distribution(
+        self,
+        column_names: list,
+        n_rows: int = None,
+        n_columns: int = None,
+        title: str = None,
+        subplot_titles: list = None,
+        x_labels: list = None,
+        y_labels: list = None,
+        x_range: tuple = None,
+        y_range: tuple = None,
+        sharex: bool = True,
+        kde: bool = True,
+        **kwargs,
+    ):
+        """
+        Plot the distributions of several columns in a grid of subplots.
+
+        With *sharex*, the histograms share bin edges computed once for the
+        whole grid. Remaining keyword arguments (such as *kde_method*) are
+        passed to :meth:`plot_column_distribution`.
+        """
+        import matplotlib.pyplot as plt
+
+        n_rows = n_rows or len(column_names)
+        n_columns = n_columns or 1
+        empty = [""] * n_rows * n_columns
+        subplot_titles = subplot_titles or empty
+        x_labels = x_labels or empty
+        y_labels = y_labels or empty
+        fig, axes = plt.subplots(
+            nrows=n_rows,
+            ncols=n_columns,
+            figsize=kwargs.pop("figsize", None),
+            sharex=sharex,
+        )
+        if sharex and "n_bins" not in kwargs and not kwargs.get("by"):
+            columns = [get_values(self.data[name]) for name in column_names]
+            kwargs["n_bins"] = get_shared_bins(columns)
+        for i, ax in enumerate(fig.axes):
+            try:
+                column_name = column_names[i]
+            except IndexError:
+                ax.axis("off")
+            else:
+                self.plot_column_distribution(
+                    column_name,
+                    axes=ax,
+                    title=subplot_titles[i],
+                    x_label=x_labels[i],
+                    y_label=y_labels[i],
+                    x_range=x_range,
+                    y_range=y_range,
+                    kde=kde,
+                    **kwargs,
+                )
+        return fig
+
+    def plot_pie_chart(
+        self,
+        column_name: str,
+        radius: float = 2.5,
+        percentage_template: str = "%1.1f%%",
+        percentage_distance: float = 0.75,
+        counterclock: bool = False,
+        colors: list = None,
+        ax: "plt.Axes" = None,
+    ) -> "plt.Axes":
+        colors = colors or get_default_colors()
+        value_counts = self.aggregates.value_counts(column_name)
+        return value_counts.plot.pie(
+            autopct=percentage_template,
+            pctdistance=percentage_distance,
+            radius=radius,
+            counterclock=counterclock,
+            colors=colors,
+            ax=ax,
+        )
+
+    def plot_pie_chart_with_table(
+        self,
+        column_name: str,
+        radius: float = 1.25,
+        percentage_template: str = "%1.1f%%",
+        percentage_distance: float = 0.75,
+        counterclock: bool = False,
+        colors: list = None,
+    ):
+        import matplotlib.pyplot as plt
+        from pandas.plotting import table
+
+        colors = colors or get_default_colors()
+        value_counts = self.aggregates.value_counts(column_name)
+        colors = self.fix_colors(value_counts, colors)
+        figure, axes = plt.subplots(ncols=2, figsize=(16, 6))
+        pie_chart = self.plot_pie_chart(
+            column_name=column_name,
+            radius=radius,
+            percentage_template=percentage_template,
+            percentage_distance=percentage_distance,
+            counterclock=counterclock,
+            colors=colors,
+            ax=axes[0],
+        )
+        axes[1].axis("off")
+        table_ = table(
+            axes[1],
+            value_counts,
+            bbox=[0.5, 0.25, 0.5, 0.75],
+            rowColours=colors,
+        )
+        table_.set_fontsize(14)
+        return pie_chart, table_
+
+    def plot_bar_chart(
+        self,
+        column_name: str,
+        figure_size: Tuple[int] = (16, 6),
+        title: str = None,
+        colors: list = None,
+        x_label: str = "Values",
+        y_label: str = "Count",
+    ) -> "plt.Axes":
+        value_counts = self.aggregates.value_counts(column_name)
+        sorted_counts = self.aggregates.sorted_counts(column_name)
+        colors = colors or get_default_colors()
+        colors = self.fix_colors(value_counts, colors, by_index=True)
+        title = title if title is not None else column_name
+        plot = sorted_counts.plot(
+            kind="bar", figsize=figure_size, title=title, color=colors
+        )
+        plot.set_xlabel(x_label)
+        plot.set_ylabel(y_label)
+        return plot
@@ -1,6 +1,7 @@
-from datetime import datetime
 from enum import Enum
+from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -115,41 +116,52 @@ REPLACE_DICT = {
     },
 }
 
+# Component scores are sums of integer codes, so "< 1" is equivalent to "<= 0"
+# and every component can be binned with right-inclusive edges.
+COMPONENT_2_EDGES = (0, 2, 4)
+COMPONENT_5_EDGES = (0, 9, 18)
+COMPONENT_7_EDGES = (0, 2, 4)
+SLEEP_EFFICIENCY_EDGES = (0.65, 0.75, 0.85)
+MINUTES_PER_DAY = 24 * 60
+TIME_FORMATS = ("%I:%M:%S %p", "%I:%M %p", "%H:%M:%S", "%H:%M")
+
 
 def convert_df(psqi_df: pd.DataFrame):
     psqi_df = psqi_df.replace(REPLACE_DICT)
-    for ind_name in psqi_df.index:
-        q2 = psqi_df.loc[ind_name, "Q_2"]
-        q4 = psqi_df.loc[ind_name, "Q_4"]
-        if (q2 <= 15).any():
-            psqi_df.loc[ind_name, "Q_2"] = 0
-        else:
-            if (q2 <= 30).any():
-                psqi_df.loc[ind_name, "Q_2"] = 1
-            else:
-                if (q2 <= 60).any():
-                    psqi_df.loc[ind_name, "Q_2"] = 2
-                else:
-                    psqi_df.loc[ind_name, "Q_2"] = 3
-        if (q4 > 7).any():
-            psqi_df.loc[ind_name, "Q_4"] = 0
-        else:
-            if (q4 >= 6).any():
-                psqi_df.loc[ind_name, "Q_4"] = 1
-            else:
-                if (q4 >= 5).any():
-                    psqi_df.loc[ind_name, "Q_4"] = 2
-                else:
-                    psqi_df.loc[ind_name, "Q_4"] = 3
+    q2 = psqi_df["Q_2"]
+    q4 = psqi_df["Q_4"]
+    psqi_df["Q_2"] = np.select([q2 <= 15, q2 <= 30, q2 <= 60], [0, 1, 2], 3)
+    psqi_df["Q_4"] = np.select([q4 > 7, q4 >= 6, q4 >= 5], [0, 1, 2], 3)
     return psqi_df
 
 
-def calculate_psqi_scores(psqi_df: pd.DataFrame) -> pd.Series:
+def calculate_psqi_scores(psqi_df: pd.DataFrame, return_invalid: bool = False):
+    """
+    Calculate PSQI global scores.
+
+    Parameters
+    ----------
+    psqi_df : pd.DataFrame
+        Subjects' PSQI responses, with columns named after
+        :class:`PsqiQuestions` (e.g. "Q_5a")
+    return_invalid : bool, optional
+        Whether to also return the mask of rows whose sleep efficiency
+        (component 4) could not be scored and was left out of their total,
+        by default False
+
+    Returns
+    -------
+    pd.Series or Tuple[pd.Series, pd.Series]
+        Global scores, and the mask of rows without sleep efficiency if
+        *return_invalid* is True
+    """
+    component_4, invalid = calculate_component_4(
+        psqi_df[["Q_4", "Q_3", "Q_1"]]
+    )
     psqi_df = convert_df(psqi_df)
     component_1 = psqi_df["Q_6"]
     component_2 = calculate_component_2(psqi_df["Q_2"] + psqi_df["Q_5a"])
     component_3 = psqi_df["Q_4"]
-    component_4 = calculate_component_4(psqi_df[["Q_4", "Q_3", "Q_1"]])
     component_5 = calculate_component_5(
         psqi_df[
             [
@@ -188,85 +200,112 @@ def calculate_psqi_scores(psqi_df: pd.DataFrame) -> pd.Series:
         "Comp_6",
         "Comp_7",
     ]
-    results = psqi_scores.sum(axis=1)
+    results = psqi_scores.astype(float).sum(axis=1)
     results.name = "PSQI"
+    if return_invalid:
+        return results, invalid
     return results
 
 
+def bin_scores(scores: pd.Series, edges: tuple, right: bool = True):
+    """
+    Assign each score the index of its bin, as delimited by sorted *edges*.
+
+    Parameters
+    ----------
+    scores : pd.Series
+        Numeric scores to bin
+    edges : tuple
+        Sorted bin edges; *n* edges delimit *n + 1* bins
+    right : bool, optional
+        Whether bins include their right edge (the default) or their left
+        edge
+
+    Returns
+    -------
+    np.ndarray
+        Bin indices, with NaN sorted into the last bin
+    """
+    side = "left" if right else "right"
+    return np.searchsorted(edges, np.asarray(scores, dtype=float), side=side)
+
+
 def calculate_component_7(scores: pd.DataFrame):
     sum_scores = scores.sum(axis=1)
-    for i, ind in enumerate(sum_scores.index):
-        score = sum_scores[i]
-        if score < 1:
-            sum_scores[i] = 0
-        else:
-            if score <= 2:
-                sum_scores[i] = 1
-            else:
-                if score <= 4:
-                    sum_scores[i] = 2
-                else:
-                    sum_scores[i] = 3
-    return sum_scores
+    binned = bin_scores(sum_scores, COMPONENT_7_EDGES)
+    return pd.Series(binned, index=sum_scores.index)
 
 
 def calculate_component_5(scores: pd.DataFrame):
     scores_sum = scores.sum(axis=1)
-    for i, ind in enumerate(scores_sum.index):
-        score = scores_sum[i]
-        if score < 1:
-            scores_sum[i] = 0
-        else:
-            if score <= 9:
-                scores_sum[i] = 1
-            else:
-                if score <= 18:
-                    scores_sum[i] = 2
-                else:
-                    scores_sum[i] = 3
-    return scores_sum
+    binned = bin_scores(scores_sum, COMPONENT_5_EDGES)
+    return pd.Series(binned, index=scores_sum.index)
+
+
+def parse_times(times: pd.Series) -> np.ndarray:
+    """
+    Parse clock times into minutes since midnight.
 
+    Parameters
+    ----------
+    times : pd.Series
+        Clock times, either as strings (e.g. "11:30:00 PM") or as time
+        objects
 
-def get_habitual_sleep_category(value: float) -> int:
-    if value >= 0.85:
-        return 0
-    elif 0.75 <= value < 0.85:
-        return 1
-    elif 0.65 >= value < 0.75:
-        return 2
-    else:
-        return 3
+    Returns
+    -------
+    np.ndarray
+        Minutes since midnight, with -1 marking missing or unparsable times
+    """
+    codes, uniques = pd.factorize(times)
+    text = pd.Series(uniques, dtype=object).astype(str)
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+    for time_format in TIME_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(
+            text[missing], format=time_format, errors="coerce"
+        )
+    minutes = parsed.dt.hour * 60 + parsed.dt.minute
+    minutes = minutes.fillna(-1).to_numpy(dtype=np.int16)
+    return np.append(minutes, np.int16(-1))[codes]
 
 
-def calculate_component_4(scores: pd.DataFrame):
-    FMT = "%H:%M:%S %p"
-    hours_in_bed = []
-    habitual_sleep = []
-    for i, ind in enumerate(scores.index):
-        morning = scores["Q_3"][i]
-        evening = scores["Q_1"][i]
-        try:
-            tdelta = datetime.strptime(morning, FMT) - datetime.strptime(
-                evening, FMT
-            )
-            hours_in_bed.append(tdelta.seconds / 60 / 60)
-            value = scores["Q_4"][i] / hours_in_bed[i]
-            category = get_habitual_sleep_category(value)
-        except Exception:
-            category = None
-        finally:
-            habitual_sleep.append(category)
-    return pd.Series(habitual_sleep, index=scores.index)
+def calculate_component_4(
+    scores: pd.DataFrame,
+) -> Tuple[pd.Series, pd.Series]:
+    """
+    Calculate habitual sleep efficiency from hours of sleep, bedtime and
+    wakeup time.
+
+    Parameters
+    ----------
+    scores : pd.DataFrame
+        Hours of sleep (Q_4), wakeup time (Q_3) and bedtime (Q_1) responses
+
+    Returns
+    -------
+    Tuple[pd.Series, pd.Series]
+        Component scores and a mask of rows that could not be scored
+    """
+    bedtime = parse_times(scores["Q_1"])
+    wakeup = parse_times(scores["Q_3"])
+    hours = pd.to_numeric(scores["Q_4"], errors="coerce").to_numpy(float)
+    minutes_in_bed = (wakeup - bedtime) % MINUTES_PER_DAY
+    invalid = (bedtime < 0) | (wakeup < 0) | np.isnan(hours)
+    invalid |= minutes_in_bed == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        efficiency = hours * 60 / minutes_in_bed
+    category = 3 - bin_scores(efficiency, SLEEP_EFFICIENCY_EDGES, right=False)
+    category = np.where(invalid, np.nan, category)
+    return (
+        pd.Series(category, index=scores.index),
+        pd.Series(invalid, index=scores.index),
+    )
 
 
 def calculate_component_2(scores: pd.Series):
-    for i, ind in enumerate(scores):
-        if ind >= 1:
-            if ind <= 2:
-                scores[i] = 1
-            else:
-                if ind <= 4:
-                    scores[i] = 2
-                else:
-                    scores[i] = 3
-    return scores
+    binned = bin_scores(scores, COMPONENT_2_EDGES).astype(float)
+    binned[scores.isna().to_numpy()] = np.nan
+    return pd.Series(binned, index=scores.index)
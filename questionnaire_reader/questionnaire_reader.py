@@ -1,73 +1,740 @@
-from os import sched_setscheduler
 import os
-from tkinter import E
-from typing import Tuple
+from concurrent.futures import Executor
+from typing import Callable, Iterator
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-from pandas.core.frame import DataFrame
-from dotenv import load_dotenv
-from pandas.plotting import table
 
-from questionnaire_reader.bfi import calculate_bfi
-from questionnaire_reader.defaults import COLUMNS, NAMES, REPLACE_DICT
+from questionnaire_reader.bfi import BFI, calculate_bfi_scores
+from questionnaire_reader.cache import (
+    get_cache_key,
+    hash_rows,
+    read_cache,
+    write_cache,
+)
+from questionnaire_reader.defaults import COLUMNS, REPLACE_DICT
+from questionnaire_reader.pipeline import (
+    Stage,
+    get_source_columns,
+    in_place,
+    run_pipeline,
+)
+from questionnaire_reader.plotting import PlottingMixin, get_default_colors
+from questionnaire_reader.profiling import Profile, Profiler
 from questionnaire_reader.psqi import PsqiQuestions, calculate_psqi_scores
-from questionnaire_reader.shs import (
-    SHS_NORMAL_SCORING,
-    SHS_REVERSED_SCORING,
-    calculate_shs,
+from questionnaire_reader.readers import (
+    CHUNK_SIZE,
+    DOWNLOAD_TIMEOUT,
+    detect_format,
+    download,
+    is_url,
+    iter_table,
+    read_header,
+    read_table,
 )
-from questionnaire_reader.utils.freedman_diaconis import freedman_diaconis
-
-DEFAULT_COLORS = plt.rcParams["axes.prop_cycle"].by_key()["color"] + [
-    "lightsalmon",
-    "greenyellow",
-    "hotpink",
-    "darkviolet",
-]
-load_dotenv()
-
-class QuestionnaireReader:
+from questionnaire_reader.schema import SCHEMA, Schema
+from questionnaire_reader.shs import calculate_shs
+from questionnaire_reader.submission import SubmissionScorer
+from questionnaire_reader.utils.dtypes import downcast
+from questionnaire_reader.utils.translate import translate
+from questionnaire_reader.writers import write_chunks
+
+INSTRUMENTS = {
+    "bfi": tuple(trait.value for trait in BFI),
+    "psqi": ("PSQI",),
+    "shs": ("SHS",),
+}
+IDENTIFIERS = ("Timestamp", "Subject ID")
+
+
+def __getattr__(name: str):
+    # DEFAULT_COLORS moved to plotting.get_default_colors so that importing
+    # the reader does not load matplotlib; the old name still works.
+    if name == "DEFAULT_COLORS":
+        return get_default_colors()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def merge_counts(counts: dict, other: dict) -> dict:
+    """
+    Add up two dictionaries of counts (e.g. of unseen responses) by key.
+    """
+    merged = dict(counts)
+    for key, added in other.items():
+        previous = merged.get(key)
+        if previous is not None:
+            added = previous.add(added, fill_value=0)
+        merged[key] = added
+    return merged
+
+
+class QuestionnaireReader(PlottingMixin):
     def __init__(
         self,
         path: str = None,
         columns: list = COLUMNS,
         replace_dict: dict = REPLACE_DICT,
+        cache_dir: str = None,
+        compact: bool = False,
+        profiling: bool = False,
+        profiling_hook: Callable = None,
+        workers: int = 1,
+        instruments: list = None,
+        names: list = None,
+        schema: Schema = None,
     ):
+        from dotenv import load_dotenv
+
+        load_dotenv()
         path = os.getenv("QUESTIONNAIRE_PATH") if path is None else path
         if path is None:
             raise ValueError("Path must be provided")
         self.path = path
         self.columns = columns
         self.replace_dict = replace_dict
-        self.raw = self.read_data()
-        self.data = self.clean_data(self.raw)
-
-    def read_data(self) -> pd.DataFrame:
-        df = pd.read_excel(
-            self.path,
-            header=0,
-            index_col=None,
-            parse_dates=True,
+        if schema is None:
+            default = replace_dict is REPLACE_DICT
+            schema = SCHEMA if default else Schema(replace_dict=replace_dict)
+        self.schema = schema
+        self.compact = compact
+        self.workers = workers
+        unknown = set(instruments or ()).difference(INSTRUMENTS)
+        if unknown:
+            raise ValueError(f"Unknown instruments: {sorted(unknown)}")
+        schema.get_indexes(names or ())
+        self.instruments = instruments
+        self.names = names
+        self.cache_dir = (
+            os.getenv("QUESTIONNAIRE_CACHE_DIR")
+            if cache_dir is None
+            else cache_dir
+        )
+        self._cache_key = None
+        self._raw = None
+        self._data = None
+        self._bfi_scores = None
+        self._psqi_scores = None
+        self._shs_scores = None
+        self._columns = {}
+        self._aggregates = None
+        self._submission_scorer = None
+        self.unseen_responses = {}
+        self.invalid_sleep_times = pd.Series(dtype=bool)
+        self.profiler = Profiler(enabled=profiling, hook=profiling_hook)
+
+    @classmethod
+    async def aload(
+        cls,
+        path: str = None,
+        executor: Executor = None,
+        timeout: float = DOWNLOAD_TIMEOUT,
+        **kwargs,
+    ) -> "QuestionnaireReader":
+        """
+        Read and clean a questionnaire export without blocking the event
+        loop; see :func:`questionnaire_reader.aio.aload`.
+
+        Parameters
+        ----------
+        path : str, optional
+            Local path or http(s) URL, by default the QUESTIONNAIRE_PATH
+            environment variable
+        executor : Executor, optional
+            Executor reading and cleaning the export, by default the event
+            loop's default (thread pool) executor
+        timeout : float, optional
+            Download socket timeout in seconds, by default 60
+        kwargs
+            Passed to :class:`QuestionnaireReader`
+
+        Returns
+        -------
+        QuestionnaireReader
+            Reader with :attr:`raw` and :attr:`data` loaded
+        """
+        import asyncio
+        import functools
+
+        from questionnaire_reader.aio import aload
+
+        loop = asyncio.get_running_loop()
+        # The constructor reads the .env file, so it runs off the loop too.
+        reader = await loop.run_in_executor(
+            None, functools.partial(cls, path, **kwargs)
+        )
+        return await aload(reader, executor=executor, timeout=timeout)
+
+    @property
+    def profile(self) -> Profile:
+        return self.profiler.profile
+
+    @property
+    def raw(self) -> pd.DataFrame:
+        if self._raw is None:
+            self.load()
+        return self._raw
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            self.compute()
+        return self._data
+
+    @property
+    def bfi_scores(self) -> pd.DataFrame:
+        if self._bfi_scores is None:
+            if self._data is None:
+                outputs = [trait.value for trait in BFI]
+                self._bfi_scores = self.clean_data(self.raw, outputs)
+            else:
+                self._bfi_scores = self._data[[trait.value for trait in BFI]]
+        return self._bfi_scores
+
+    @property
+    def psqi_scores(self) -> pd.Series:
+        if self._psqi_scores is None:
+            if self._data is None:
+                scores = self.clean_data(self.raw, ["PSQI"])
+                self._psqi_scores = scores["PSQI"]
+            else:
+                self._psqi_scores = self._data["PSQI"]
+        return self._psqi_scores
+
+    @property
+    def shs_scores(self) -> pd.Series:
+        if self._shs_scores is None:
+            if self._data is None:
+                self._shs_scores = self.clean_data(self.raw, ["SHS"])["SHS"]
+            else:
+                self._shs_scores = self._data["SHS"]
+        return self._shs_scores
+
+    def get_column(self, name: str) -> pd.Series:
+        """
+        Get a single column of :attr:`data`, only running the stages it
+        depends on if the full clean dataset has not been computed yet (e.g.
+        reading "Sex" does not parse PSQI times).
+
+        Parameters
+        ----------
+        name : str
+            Column name
+
+        Returns
+        -------
+        pd.Series
+            Clean column
+        """
+        if self._data is not None:
+            return self._data[name]
+        if name not in self._columns:
+            self._columns[name] = self.clean_data(self.raw, [name])[name]
+        return self._columns[name]
+
+    def get_cache_key(self) -> str:
+        if self._cache_key is None and self.cache_dir:
+            self._cache_key = get_cache_key(
+                self.path,
+                columns=self.columns,
+                replace_dict=self.replace_dict,
+                schema=self.schema.names,
+                compact=self.compact,
+                instruments=self.instruments,
+                names=self.names,
+            )
+        return self._cache_key
+
+    def load(self, source=None) -> pd.DataFrame:
+        """
+        Read the raw data, or both the raw and clean data if they are
+        available in the cache directory.
+
+        Parameters
+        ----------
+        source : str or file-like, optional
+            Where to read :attr:`path`'s contents from, e.g. a buffer it was
+            downloaded to, by default :attr:`path` itself
+
+        Returns
+        -------
+        pd.DataFrame
+            Raw dataset
+        """
+        key = self.get_cache_key()
+        cached = read_cache(self.cache_dir, key) if key else None
+        if cached is None:
+            with self.profiler.stage("read_data") as counts:
+                names = self.get_source_names()
+                self._raw = self.read_data(source, names=names)
+                counts["rows"] = len(self._raw)
+        else:
+            self._raw, self._data = cached.raw, cached.data
+            self.unseen_responses = cached.unseen_responses
+            self.invalid_sleep_times = cached.invalid_sleep_times
+        return self._raw
+
+    def compute(self) -> pd.DataFrame:
+        """
+        Clean the raw data and calculate all instrument scores, storing the
+        results in the cache directory if one is configured.
+
+        Returns
+        -------
+        pd.DataFrame
+            Clean dataset
+        """
+        raw = self.raw
+        if self._data is None:
+            self._data = self.clean_data(raw)
+            self.write_cache()
+        return self._data
+
+    def write_cache(self) -> None:
+        """
+        Store the clean data and its diagnostics in the cache directory, if
+        one is configured.
+        """
+        key = self.get_cache_key()
+        if key:
+            write_cache(
+                self.cache_dir,
+                key,
+                self._raw,
+                self._data,
+                self.unseen_responses,
+                self.invalid_sleep_times,
+            )
+
+    def get_timestamps(self, df: pd.DataFrame) -> pd.Series:
+        return pd.to_datetime(df["Timestamp"], errors="coerce")
+
+    @property
+    def last_timestamp(self) -> pd.Timestamp:
+        """
+        Latest submission timestamp among the responses read so far.
+        """
+        return self.get_timestamps(self.raw).max()
+
+    def append(self, path=None) -> pd.DataFrame:
+        """
+        Clean and score only the responses in *path* that were not read yet,
+        and add them to :attr:`raw` and :attr:`data`.
+
+        Responses are told apart by their contents rather than their
+        timestamps, so that responses submitted within the same second or
+        without a timestamp are not lost. When re-reading :attr:`path`
+        itself, it is expected to have only grown: if responses read before
+        were edited or removed, the whole export is cleaned again.
+
+        Parameters
+        ----------
+        path : str or file-like, optional
+            Export to read, by default :attr:`path`
+
+        Returns
+        -------
+        pd.DataFrame
+            Clean new (or edited) responses
+        """
+        data = self.data
+        raw = self.read_data(path, names=self.get_source_names())
+        known = hash_rows(self._raw)
+        hashes = hash_rows(raw)
+        is_new = ~hashes.isin(known).to_numpy()
+        refresh = path is None or path == self.path
+        if refresh:
+            n_known = len(known)
+            if not np.array_equal(hashes.to_numpy()[:n_known], known):
+                self.reset(raw)
+                return self.compute()[is_new]
+            new = raw.iloc[n_known:]
+        else:
+            new = raw[is_new]
+        if new.empty:
+            return data.iloc[:0]
+        unseen_responses = self.unseen_responses
+        invalid_sleep_times = self.invalid_sleep_times
+        clean = self.clean_data(new)
+        self._raw = pd.concat([self._raw, new], ignore_index=True)
+        self._data = pd.concat([data, clean], ignore_index=True)
+        clean.index = self._data.index[len(data) :]
+        self.unseen_responses = merge_counts(
+            unseen_responses, self.unseen_responses
         )
-        df = df.drop([col for col in df.columns if col.startswith("Unnamed")], axis=1)
-        df.columns = NAMES
+        if self.invalid_sleep_times is not invalid_sleep_times:
+            self.invalid_sleep_times.index = clean.index
+            self.invalid_sleep_times = pd.concat(
+                [invalid_sleep_times, self.invalid_sleep_times]
+            )
+        self.reset(self._raw, self._data)
+        if refresh:
+            self.write_cache()
+        return clean
+
+    def reset(self, raw: pd.DataFrame, data: pd.DataFrame = None) -> None:
+        """
+        Replace the raw (and clean) dataset, discarding everything derived
+        from the previous one.
+        """
+        self._raw = raw
+        self._data = data
+        self._bfi_scores = None
+        self._psqi_scores = None
+        self._shs_scores = None
+        self._columns = {}
+        self._cache_key = None
+
+    def refresh(self) -> pd.DataFrame:
+        """
+        Clean and score the responses added to :attr:`path` since it was last
+        read.
+
+        Returns
+        -------
+        pd.DataFrame
+            Clean new responses
+        """
+        return self.append()
+
+    def read_data(self, path=None, names: list = None) -> pd.DataFrame:
+        """
+        Read the questionnaire export, optionally only reading some of its
+        columns.
+
+        Parameters
+        ----------
+        path : str or file-like, optional
+            Export to read, by default :attr:`path`
+        names : list, optional
+            Names (see :attr:`schema`) of the
+            columns to read, by default all columns
+
+        Returns
+        -------
+        pd.DataFrame
+            Raw dataset
+        """
+        path = self.get_source(path)
+        file_format = detect_format(path)
+        if file_format == "excel":
+            # Workbooks are parsed whole even to read their header, so the
+            # header is checked on the sheet once read instead.
+            df = read_table(path, file_format, None)
+            positions, names = self.get_positions(list(df.columns), names)
+            df = df.iloc[:, positions]
+        else:
+            header = read_header(path, file_format)
+            positions, names = self.get_positions(header, names)
+            df = read_table(path, file_format, header, usecols=positions)
+        df.columns = names
         return df
 
+    def get_source(self, path=None):
+        """
+        Return where to read *path* (by default :attr:`path`) from, which is
+        an in-memory copy for http(s) URLs, downloaded once so that the
+        header and body are read from the same version of the export.
+        """
+        path = self.path if path is None else path
+        return download(path) if is_url(path) else path
+
+    def get_positions(self, header: list, names: list = None) -> tuple:
+        """
+        Match an export's *header* against :attr:`schema` and find the
+        positions of the columns called *names* (by default all columns).
+
+        Returns
+        -------
+        tuple
+            Column positions in the export and their names
+        """
+        positions = self.schema.check_header(header)
+        if names is None:
+            return positions, self.schema.names
+        indexes = self.schema.get_indexes(names)
+        positions = [positions[i] for i in indexes]
+        return positions, self.schema.get_names(indexes)
+
+    def iter_data(
+        self, path=None, names: list = None, chunksize: int = CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read the questionnaire export in chunks of at most *chunksize* rows.
+
+        Parameters
+        ----------
+        path : str or file-like, optional
+            Export to read, by default :attr:`path`
+        names : list, optional
+            Names of the columns to read, by default all columns
+        chunksize : int, optional
+            Maximal number of rows per chunk
+
+        Yields
+        ------
+        pd.DataFrame
+            Raw rows
+        """
+        path = self.get_source(path)
+        file_format = detect_format(path)
+        header = read_header(path, file_format)
+        positions, names = self.get_positions(header, names)
+        chunks = iter_table(
+            path, file_format, header, usecols=positions, chunksize=chunksize
+        )
+        for chunk in chunks:
+            chunk.columns = names
+            yield chunk
+
+    def score_stream(
+        self,
+        path,
+        out: str,
+        chunksize: int = CHUNK_SIZE,
+        out_format: str = None,
+    ) -> int:
+        """
+        Clean and score an export chunk by chunk, appending the results to
+        *out*, so that memory use does not depend on the export's size.
+        Neither :attr:`raw` nor :attr:`data` are kept, but
+        :attr:`unseen_responses` and :attr:`invalid_sleep_times` cover the
+        whole export.
+
+        Parameters
+        ----------
+        path : str or file-like
+            Export to read, or None for :attr:`path`
+        out : str
+            Output path
+        chunksize : int, optional
+            Maximal number of rows held in memory at once
+        out_format : str, optional
+            "csv" or "parquet" (or "feather"), by default detected from
+            *out*'s extension; numeric Parquet and Feather columns are
+            written as doubles, and columns empty in the first chunk as
+            strings, so that all chunks share a schema
+
+        Returns
+        -------
+        int
+            Number of rows written
+        """
+        unseen_responses = {}
+        invalid_sleep_times = []
+        n_rows = 0
+
+        def clean_chunks() -> Iterator[pd.DataFrame]:
+            nonlocal n_rows, unseen_responses
+            names = self.get_source_names()
+            for chunk in self.iter_data(path, names, chunksize):
+                self.invalid_sleep_times = pd.Series(dtype=bool)
+                clean = self.clean_data(chunk)
+                invalid_sleep_times.append(self.invalid_sleep_times)
+                unseen_responses = merge_counts(
+                    unseen_responses, self.unseen_responses
+                )
+                n_rows += len(clean)
+                yield clean
+
+        write_chunks(out, clean_chunks(), file_format=out_format, promote=True)
+        self.unseen_responses = unseen_responses
+        # Indexed by position in *out*, since chunks may restart their index.
+        self.invalid_sleep_times = pd.concat(
+            invalid_sleep_times or [pd.Series(dtype=bool)], ignore_index=True
+        )
+        return n_rows
+
+    def score_submission(self, record: dict) -> dict:
+        """
+        Clean and score a single submission without building data frames,
+        e.g. as it is submitted; see
+        :class:`~questionnaire_reader.submission.SubmissionScorer`.
+
+        Parameters
+        ----------
+        record : dict
+            Raw responses by column name
+
+        Returns
+        -------
+        dict
+            Clean fields and instrument scores, as in a row of :attr:`data`
+        """
+        if self._submission_scorer is None:
+            self._submission_scorer = SubmissionScorer(
+                self.schema,
+                self.replace_dict,
+                self.get_column_name("height"),
+            )
+        return self._submission_scorer.score(record)
+
     def get_column_name(self, key: str) -> str:
         default = key.title().replace("_", " ")
         return self.columns.get(key, default)
 
-    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        clean = self.raw.copy()
-        self.fix_height(clean)
-        self.replace_values(clean)
-        self.fix_attention_deficit(clean)
-        clean = self.convert_bfi_responses_to_results(clean)
-        clean = self.convert_psqi_responses_to_results(clean)
-        clean = self.convert_shs_responses_to_results(clean)
+    def get_source_names(self) -> list:
+        """
+        Names of the source columns needed to produce the selected
+        :attr:`instruments` and :attr:`names`, in export order. The
+        :data:`IDENTIFIERS` columns are always kept, so that responses can
+        be told apart and refreshed.
+
+        Returns
+        -------
+        list
+            Column names, or None if no selection was made and all columns
+            are needed
+        """
+        if self.instruments is None and self.names is None:
+            return None
+        outputs = list(IDENTIFIERS) + list(self.names or ())
+        for instrument in self.instruments or ():
+            outputs += INSTRUMENTS[instrument]
+        stages = self.get_stages(self.schema.names)
+        needed = get_source_columns(stages, outputs)
+        return [name for name in self.schema.names if name in needed]
+
+    def get_stages(self, names: list) -> list:
+        """
+        Declare the cleaning and scoring stages applicable to a dataset with
+        columns *names*, in the order they would run sequentially.
+
+        Parameters
+        ----------
+        names : list
+            Column names of the raw dataset
+
+        Returns
+        -------
+        list
+            :class:`~questionnaire_reader.pipeline.Stage` instances whose
+            input columns are all available
+        """
+        height = (self.get_column_name("height"),)
+        available = set(names)
+        replaced = tuple(
+            name for name in self.schema.replaced_names if name in available
+        )
+        attention = ("Attention Deficit Disorder",)
+        bfi = self.schema.instrument_names["bfi"]
+        psqi = self.schema.instrument_names["psqi"]
+        shs = self.schema.instrument_names["shs"]
+        stages = [
+            Stage(
+                "fix_height",
+                in_place(self.fix_height),
+                height,
+                height,
+                columnwise=True,
+            ),
+            Stage(
+                "replace_values",
+                in_place(self.replace_values),
+                replaced,
+                replaced,
+                columnwise=True,
+            ),
+            Stage(
+                "fix_attention_deficit",
+                in_place(self.fix_attention_deficit),
+                attention + ("Attention Deficit Disorder (1)",),
+                attention,
+                ("Attention Deficit Disorder (1)",),
+            ),
+            Stage(
+                "bfi",
+                self.get_bfi_scores,
+                bfi,
+                tuple(trait.value for trait in BFI),
+                bfi,
+            ),
+            Stage("psqi", self.get_psqi_scores, psqi, ("PSQI",), psqi),
+            Stage(
+                "shs",
+                lambda shs_df: calculate_shs(shs_df).rename("SHS"),
+                shs,
+                ("SHS",),
+                shs,
+            ),
+        ]
+        return [
+            stage
+            for stage in stages
+            if stage.inputs and available.issuperset(stage.inputs)
+        ]
+
+    def clean_data(
+        self, df: pd.DataFrame, outputs: list = None
+    ) -> pd.DataFrame:
+        """
+        Clean *df* and calculate instrument scores, running independent
+        stages (see :meth:`get_stages`) concurrently.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Raw dataset, which is left unchanged
+        outputs : list, optional
+            Columns to return, by default the full clean dataset; only the
+            stages they depend on are run
+
+        Returns
+        -------
+        pd.DataFrame
+            Clean dataset
+        """
+        stages = self.get_stages(list(df.columns))
+        if outputs is not None:
+            self.check_outputs(df, stages, outputs)
+        # Stages profiled concurrently would share tracemalloc's peak.
+        workers = 1 if self.profiler.enabled else self.workers
+        clean = run_pipeline(
+            df,
+            stages,
+            outputs=outputs,
+            workers=workers,
+            profiler=self.profiler,
+        )
+        if self.compact:
+            with self.profiler.stage("compact_dtypes", len(clean)):
+                self.compact_dtypes(clean)
         return clean
 
+    def check_outputs(
+        self, df: pd.DataFrame, stages: list, outputs: list
+    ) -> None:
+        """
+        Raise a ValueError if some of *outputs* are neither columns of *df*
+        nor produced by *stages*, naming the instruments that were not
+        selected or whose columns are missing.
+        """
+        available = set(df.columns)
+        for stage in stages:
+            available.update(stage.outputs)
+        missing = [name for name in outputs if name not in available]
+        if not missing:
+            return
+        selection = self.instruments is not None or self.names is not None
+        selected = list(self.instruments or ())
+        for instrument, scores in INSTRUMENTS.items():
+            if not set(missing).intersection(scores):
+                continue
+            if selection and instrument not in selected:
+                reason = (
+                    f"the {instrument!r} instrument was not selected "
+                    f"(instruments={selected})"
+                )
+            else:
+                reason = (
+                    f"the dataset lacks some of the {instrument!r} columns"
+                )
+            message = f"{instrument.upper()} scores are unavailable: {reason}"
+            raise ValueError(message)
+        message = f"Unavailable columns: {missing}"
+        if selection:
+            message += " (only the selected names and instruments are read)"
+        raise ValueError(message)
+
     def fix_height_value(self, value: str) -> float:
         try:
             value = float(value)
@@ -88,19 +755,50 @@ class QuestionnaireReader:
         df.drop("Attention Deficit Disorder (1)", axis=1, inplace=True)
 
     def replace_values(self, df: pd.DataFrame) -> None:
-        df.replace(self.replace_dict, inplace=True)
-        for key, value in self.replace_dict.items():
-            df.loc[~df[key].isin(value.values()), key] = "N/A"
+        """
+        Translate the responses in the columns of :attr:`replace_dict` in
+        place, marking unknown or missing responses as "N/A" and recording
+        unknown responses in :attr:`unseen_responses`.
 
-    def check_bfi_column_name(self, column_name: str) -> bool:
-        return column_name.startswith("BFI")
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Dataset to clean
+        """
+        self.unseen_responses = {}
+        for key, mapping in self.replace_dict.items():
+            if key not in df:
+                continue
+            translated, unseen = translate(df[key], mapping)
+            df[key] = pd.Series(translated, index=df.index, dtype=object)
+            if not unseen.empty:
+                self.unseen_responses[key] = unseen
+
+    def get_categories(self, key: str) -> list:
+        values = self.replace_dict[key].values()
+        categories = dict.fromkeys(value for value in values if value)
+        categories["N/A"] = None
+        return list(categories)
+
+    def compact_dtypes(self, df: pd.DataFrame) -> None:
+        """
+        Convert replaced columns to categoricals and downcast numeric
+        columns, in place.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Clean dataset
+        """
+        for key in self.replace_dict:
+            if key in df.columns:
+                categories = self.get_categories(key)
+                df[key] = pd.Categorical(df[key], categories=categories)
+        for column_name in df.select_dtypes("number").columns:
+            df[column_name] = downcast(df[column_name])
 
     def get_bfi_column_names(self, df: pd.DataFrame) -> list:
-        return [
-            column_name
-            for column_name in df.columns
-            if self.check_bfi_column_name(column_name)
-        ]
+        return list(self.schema.instrument_names["bfi"])
 
     def get_bfi_responses(self, df: pd.DataFrame) -> pd.DataFrame:
         column_names = self.get_bfi_column_names(df)
@@ -110,7 +808,7 @@ class QuestionnaireReader:
 
     def get_bfi_scores(self, df: pd.DataFrame) -> pd.Series:
         bfi_responses = self.get_bfi_responses(df)
-        return bfi_responses.apply(calculate_bfi, axis=1)
+        return calculate_bfi_scores(bfi_responses)
 
     def convert_bfi_responses_to_results(
         self, df: pd.DataFrame
@@ -121,7 +819,7 @@ class QuestionnaireReader:
         return pd.concat([df, bfi_scores], axis=1)
 
     def get_psqi_responses(self, df: pd.DataFrame) -> pd.DataFrame:
-        psqi = df.iloc[:, 43:69].copy()
+        psqi = df[list(self.schema.instrument_names["psqi"])].copy()
         column_names = []
         for i, col in enumerate(psqi.columns):
             question = f"PSQI_{i}"
@@ -130,12 +828,30 @@ class QuestionnaireReader:
         return psqi
 
     def get_psqi_scores(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Calculate PSQI scores, recording the rows whose bedtime, wakeup time
+        or hours of sleep could not be used (so that their total leaves out
+        sleep efficiency) in :attr:`invalid_sleep_times`.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Dataset containing the PSQI columns
+
+        Returns
+        -------
+        pd.Series
+            PSQI scores
+        """
         psqi = self.get_psqi_responses(df)
-        return calculate_psqi_scores(psqi)
+        scores, invalid = calculate_psqi_scores(psqi, return_invalid=True)
+        self.invalid_sleep_times = invalid
+        return scores
 
     def convert_psqi_responses_to_results(self, df: pd.DataFrame) -> None:
         psqi_scores = self.get_psqi_scores(df)
-        df.drop(labels=df.columns[43:69], axis=1, inplace=True)
+        psqi_columns = list(self.schema.instrument_names["psqi"])
+        df.drop(labels=psqi_columns, axis=1, inplace=True)
         return pd.concat([df, psqi_scores], axis=1)
 
     def convert_shs_responses_to_results(
@@ -155,196 +871,10 @@ class QuestionnaireReader:
             A single column containing subjects' caclulated SHS score
         """
         shs_scores = calculate_shs(df)
-        df = df.drop(SHS_REVERSED_SCORING + SHS_NORMAL_SCORING, axis=1).copy()
+        shs_columns = list(self.schema.instrument_names["shs"])
+        df = df.drop(shs_columns, axis=1).copy()
         df["SHS"] = shs_scores
         return df
 
     def calculate_bmi(self, df: pd.DataFrame) -> None:
         return df["Weight (kg)"] / ((df["Height (cm)"] / 100) ** 2)
-
-    def fix_colors(
-        self, value_counts: pd.Series, colors: list, by_index: bool = False
-    ):
-        count_indices = value_counts.index.to_list()
-        try:
-            na_index = count_indices.index("N/A")
-        except ValueError:
-            pass
-        else:
-            colors[na_index] = "lightgrey"
-        if by_index:
-            colors = [
-                color for _, color in sorted(zip(value_counts.index, colors))
-            ]
-        return colors
-
-    def plot_column_distribution(
-        self,
-        column_name: str,
-        axes: plt.Axes = None,
-        title: str = None,
-        x_label: str = None,
-        y_label: str = None,
-        x_range: tuple = None,
-        y_range: tuple = None,
-        n_bins: int = None,
-        kde: bool = True,
-        **kwargs,
-    ):
-        column = self.data[column_name].dropna()
-        if axes is None:
-            _, axes = plt.subplots(figsize=kwargs.get("figsize"))
-
-        # Plot histogram
-        n_bins = n_bins or freedman_diaconis(column)
-        DEFAULTS = {
-            "bins": n_bins,
-            "color": "blue",
-            "grid": False,
-        }
-        configuration = {**DEFAULTS, **kwargs}
-        self.data.hist(column=column_name, ax=axes, **configuration)
-
-        # Set title
-        axes.set_title(title or f"{column_name} Distribution")
-
-        # Set axis labels
-        axes.set_xlabel(x_label or column_name)
-        if y_label is None:
-            if configuration.get("density"):
-                y_label = "Probability Density"
-            else:
-                y_label = "Number of Observations"
-        axes.set_ylabel(y_label)
-
-        # Set axis ranges
-        if x_range:
-            axes.set_xlim(x_range)
-        if y_range:
-            axes.set_ylim(y_range)
-
-        # Plot KDE
-        if kde and not configuration.get("by"):
-            axes_2 = axes.twinx()
-            column.plot.kde(ax=axes_2, color="red", legend=False)
-            axes_2.set_ylabel("KDE")
-            axes_2.set_ylim(0)
-        return axes
-
-    def plot_distribution(
-        self,
-        column_names: list,
-        n_rows: int = None,
-        n_columns: int = None,
-        title: str = None,
-        subplot_titles: list = None,
-        x_labels: list = None,
-        y_labels: list = None,
-        x_range: tuple = None,
-        y_range: tuple = None,
-        sharex: bool = True,
-        kde: bool = True,
-        **kwargs,
-    ):
-        n_rows = n_rows or len(column_names)
-        n_columns = n_columns or 1
-        empty = [""] * n_rows * n_columns
-        subplot_titles = subplot_titles or empty
-        x_labels = x_labels or empty
-        y_labels = y_labels or empty
-        fig, axes = plt.subplots(
-            nrows=n_rows,
-            ncols=n_columns,
-            figsize=kwargs.get("figsize"),
-            sharex=sharex,
-        )
-        for i, ax in enumerate(fig.axes):
-            try:
-                column_name = column_names[i]
-            except IndexError:
-                ax.axis("off")
-            else:
-                self.plot_column_distribution(
-                    column_name,
-                    axes=ax,
-                    title=subplot_titles[i],
-                    x_label=x_labels[i],
-                    y_label=y_labels[i],
-                    x_range=x_range,
-                    y_range=y_range,
-                )
-        return fig
-
-    def plot_pie_chart(
-        self,
-        column_name: str,
-        radius: float = 2.5,
-        percentage_template: str = "%1.1f%%",
-        percentage_distance: float = 0.75,
-        counterclock: bool = False,
-        colors: list = None,
-        ax: plt.Axes = None,
-    ) -> plt.Axes:
-        colors = colors or DEFAULT_COLORS.copy()
-        value_counts = self.data[column_name].value_counts()
-        return value_counts.plot.pie(
-            autopct=percentage_template,
-            pctdistance=percentage_distance,
-            radius=radius,
-            counterclock=counterclock,
-            colors=colors,
-            ax=ax,
-        )
-
-    def plot_pie_chart_with_table(
-        self,
-        column_name: str,
-        radius: float = 1.25,
-        percentage_template: str = "%1.1f%%",
-        percentage_distance: float = 0.75,
-        counterclock: bool = False,
-        colors: list = None,
-    ):
-        colors = colors or DEFAULT_COLORS.copy()
-        value_counts = self.data[column_name].value_counts()
-        colors = self.fix_colors(value_counts, colors)
-        figure, axes = plt.subplots(ncols=2, figsize=(16, 6))
-        pie_chart = self.plot_pie_chart(
-            column_name=column_name,
-            radius=radius,
-            percentage_template=percentage_template,
-            percentage_distance=percentage_distance,
-            counterclock=counterclock,
-            colors=colors,
-            ax=axes[0],
-        )
-        axes[1].axis("off")
-        table_ = table(
-            axes[1],
-            value_counts,
-            bbox=[0.5, 0.25, 0.5, 0.75],
-            rowColours=colors,
-        )
-        table_.set_fontsize(14)
-        return pie_chart, table_
-
-    def plot_bar_chart(
-        self,
-        column_name: str,
-        figure_size: Tuple[int] = (16, 6),
-        title: str = None,
-        colors: list = None,
-        x_label: str = "Values",
-        y_label: str = "Count",
-    ) -> plt.Axes:
-        value_counts = self.data[column_name].value_counts()
-        sorted_counts = value_counts.sort_index()
-        colors = colors or DEFAULT_COLORS.copy()
-        colors = self.fix_colors(value_counts, colors, by_index=True)
-        title = title if title is not None else column_name
-        plot = sorted_counts.plot(
-            kind="bar", figsize=figure_size, title=title, color=colors
-        )
-        plot.set_xlabel(x_label)
-        plot.set_ylabel(y_label)
-        return plot
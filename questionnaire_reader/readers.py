@@ -0,0 +1,272 @@
+import io
+import os
+from typing import Iterator
+from urllib.parse import urlparse
+
+import pandas as pd
+
+EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".xlsx": "excel",
+    ".xlsm": "excel",
+    ".xls": "excel",
+}
+CHUNK_SIZE = 50_000
+# Seconds a download may stall before failing.
+DOWNLOAD_TIMEOUT = 60.0
+MAGIC_NUMBERS = (
+    (b"PAR1", "parquet"),
+    (b"ARROW1", "feather"),
+    (b"PK\x03\x04", "excel"),
+    (b"\xd0\xcf\x11\xe0", "excel"),
+)
+
+
+def is_url(path) -> bool:
+    return isinstance(path, str) and urlparse(path).scheme in (
+        "http",
+        "https",
+    )
+
+
+def download(url: str, timeout: float = DOWNLOAD_TIMEOUT) -> io.BytesIO:
+    """
+    Download *url* into memory, so that its header and body are read from
+    the same copy.
+
+    Parameters
+    ----------
+    url : str
+        http(s) URL
+    timeout : float, optional
+        Socket timeout in seconds, by default 60; None uses the global
+        default
+
+    Returns
+    -------
+    io.BytesIO
+        Downloaded contents, rewound
+    """
+    from urllib.request import urlopen
+
+    kwargs = {} if timeout is None else {"timeout": timeout}
+    with urlopen(url, **kwargs) as response:
+        return io.BytesIO(response.read())
+
+
+def rewind(path) -> None:
+    if hasattr(path, "seek"):
+        path.seek(0)
+
+
+def read_magic_number(path, size: int = 8) -> bytes:
+    if hasattr(path, "read"):
+        rewind(path)
+        magic = path.read(size)
+        rewind(path)
+        return magic if isinstance(magic, bytes) else b""
+    if os.path.isfile(path):
+        with open(path, "rb") as fh:
+            return fh.read(size)
+    return b""
+
+
+def detect_format(path) -> str:
+    """
+    Detect the format of a questionnaire export by its extension or, failing
+    that, by its contents.
+
+    Parameters
+    ----------
+    path : str or file-like
+        Local path, URL or binary buffer
+
+    Returns
+    -------
+    str
+        One of "csv", "parquet", "feather" or "excel"
+    """
+    if isinstance(path, (str, os.PathLike)):
+        extension = os.path.splitext(urlparse(str(path)).path)[1].lower()
+        if extension in EXTENSIONS:
+            return EXTENSIONS[extension]
+    magic = read_magic_number(path)
+    for magic_number, file_format in MAGIC_NUMBERS:
+        if magic.startswith(magic_number):
+            return file_format
+    return "csv"
+
+
+def read_header(path, file_format: str) -> list:
+    """
+    Read the column headers of a questionnaire export without reading its
+    body.
+
+    Parameters
+    ----------
+    path : str or file-like
+        Local path, URL or binary buffer
+    file_format : str
+        Export format, as returned by :func:`detect_format`
+
+    Returns
+    -------
+    list
+        Column headers
+    """
+    rewind(path)
+    if file_format == "csv":
+        header = pd.read_csv(path, header=0, nrows=0).columns
+    elif file_format == "excel":
+        header = pd.read_excel(path, header=0, nrows=0).columns
+    elif file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        header = pq.read_schema(path).names
+    elif file_format == "feather":
+        import pyarrow.ipc as ipc
+
+        header = ipc.open_file(path).schema.names
+    else:
+        raise ValueError(f"Unsupported format: {file_format}")
+    rewind(path)
+    return list(header)
+
+
+def read_table(
+    path, file_format: str, header: list, usecols: list = None
+) -> pd.DataFrame:
+    """
+    Read a questionnaire export, optionally only reading some of its columns.
+
+    Parameters
+    ----------
+    path : str or file-like
+        Local path, URL or binary buffer
+    file_format : str
+        Export format, as returned by :func:`detect_format`
+    header : list
+        Column headers, as returned by :func:`read_header`
+    usecols : list, optional
+        Sorted positions of the columns to read, by default all columns
+
+    Returns
+    -------
+    pd.DataFrame
+        Export contents, with columns in file order
+    """
+    rewind(path)
+    if file_format == "csv":
+        return pd.read_csv(path, header=0, usecols=usecols)
+    if file_format == "excel":
+        return pd.read_excel(
+            path, header=0, index_col=None, parse_dates=True, usecols=usecols
+        )
+    columns = None if usecols is None else [header[i] for i in usecols]
+    if file_format == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    if file_format == "feather":
+        return pd.read_feather(path, columns=columns)
+    raise ValueError(f"Unsupported format: {file_format}")
+
+
+def iter_excel(path, usecols: list, chunksize: int):
+    from openpyxl import load_workbook
+
+    rewind(path)
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows)
+        positions = range(len(header)) if usecols is None else usecols
+        columns = [header[i] for i in positions]
+        chunk = []
+        for row in rows:
+            # Sheets without stored dimensions (e.g. written by openpyxl's
+            # write-only mode) yield rows without their trailing empty cells.
+            missing = len(header) - len(row)
+            if missing > 0:
+                row += (None,) * missing
+            chunk.append([row[i] for i in positions])
+            if len(chunk) == chunksize:
+                yield pd.DataFrame(chunk, columns=columns)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns)
+    finally:
+        workbook.close()
+
+
+def iter_feather(path, header: list, usecols: list, chunksize: int):
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    source = pa.memory_map(path) if isinstance(path, str) else path
+    reader = ipc.open_file(source)
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        if usecols is not None:
+            batch = batch.select([header[j] for j in usecols])
+        for offset in range(0, batch.num_rows, chunksize):
+            yield batch.slice(offset, chunksize).to_pandas()
+
+
+def iter_table(
+    path,
+    file_format: str,
+    header: list,
+    usecols: list = None,
+    chunksize: int = CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a questionnaire export in chunks of at most *chunksize* rows,
+    optionally only reading some of its columns.
+
+    Parameters
+    ----------
+    path : str or file-like
+        Local path, URL or binary buffer
+    file_format : str
+        Export format, as returned by :func:`detect_format`
+    header : list
+        Column headers, as returned by :func:`read_header`
+    usecols : list, optional
+        Sorted positions of the columns to read, by default all columns
+    chunksize : int, optional
+        Maximal number of rows per chunk, by default 50,000
+
+    Yields
+    ------
+    pd.DataFrame
+        Consecutive rows of the export, with columns in file order and a
+        running row index
+    """
+    rewind(path)
+    if file_format == "csv":
+        yield from pd.read_csv(
+            path, header=0, usecols=usecols, chunksize=chunksize
+        )
+        return
+    if file_format == "excel":
+        chunks = iter_excel(path, usecols, chunksize)
+    elif file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        columns = None if usecols is None else [header[i] for i in usecols]
+        batches = pq.ParquetFile(path).iter_batches(
+            batch_size=chunksize, columns=columns
+        )
+        chunks = (batch.to_pandas() for batch in batches)
+    elif file_format == "feather":
+        chunks = iter_feather(path, header, usecols, chunksize)
+    else:
+        raise ValueError(f"Unsupported format: {file_format}")
+    start = 0
+    for chunk in chunks:
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
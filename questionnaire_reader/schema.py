@@ -0,0 +1,102 @@
+from typing import Dict, Iterable
+
+import numpy as np
+
+from questionnaire_reader.defaults import NAMES, PSQI_NAMES, REPLACE_DICT
+from questionnaire_reader.shs import SHS_NORMAL_SCORING, SHS_REVERSED_SCORING
+
+
+class Schema:
+    """
+    Column layout of a questionnaire export, compiled once into name lookups
+    and per-instrument column indexes and shared by any number of readers.
+
+    Parameters
+    ----------
+    names : Iterable[str], optional
+        Column names, in export order, by default
+        :data:`~questionnaire_reader.defaults.NAMES`
+    replace_dict : dict, optional
+        Translations by column name, by default
+        :data:`~questionnaire_reader.defaults.REPLACE_DICT`
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str] = NAMES,
+        replace_dict: dict = REPLACE_DICT,
+    ):
+        self.names = tuple(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        psqi = set(PSQI_NAMES)
+        shs = set(SHS_NORMAL_SCORING + SHS_REVERSED_SCORING)
+        self.instruments: Dict[str, np.ndarray] = {
+            "bfi": self.find(lambda name: name.startswith("BFI")),
+            "psqi": self.find(lambda name: name in psqi),
+            "shs": self.find(lambda name: name in shs),
+        }
+        self.replaced = self.find(lambda name: name in replace_dict)
+        self.instrument_names = {
+            instrument: tuple(self.get_names(indexes))
+            for instrument, indexes in self.instruments.items()
+        }
+        self.replaced_names = tuple(self.get_names(self.replaced))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find(self, predicate) -> np.ndarray:
+        return np.array(
+            [i for i, name in enumerate(self.names) if predicate(name)],
+            dtype=np.intp,
+        )
+
+    def get_names(self, indexes: Iterable[int]) -> list:
+        return [self.names[i] for i in indexes]
+
+    def get_indexes(self, names: Iterable[str]) -> np.ndarray:
+        """
+        Sorted column indexes of *names*, raising a ValueError for names
+        that are not part of the schema.
+        """
+        unknown = set(names).difference(self.index)
+        if unknown:
+            raise ValueError(f"Unknown column names: {sorted(unknown)}")
+        return np.unique([self.index[name] for name in names]).astype(np.intp)
+
+    def check_header(self, header: list) -> list:
+        """
+        Match an export's header row against the schema, so that wrongly
+        shaped exports are rejected before their body is read.
+
+        Parameters
+        ----------
+        header : list
+            Column headers, as returned by
+            :func:`~questionnaire_reader.readers.read_header`
+
+        Returns
+        -------
+        list
+            Position in *header* of each schema column, ignoring unnamed
+            (index) columns
+
+        Raises
+        ------
+        ValueError
+            If the number of named columns does not match the schema
+        """
+        positions = [
+            i
+            for i, column in enumerate(header)
+            if not str(column).startswith("Unnamed")
+        ]
+        if len(positions) != len(self.names):
+            message = (
+                f"Expected {len(self.names)} columns, found {len(positions)}"
+            )
+            raise ValueError(message)
+        return positions
+
+
+SCHEMA = Schema()
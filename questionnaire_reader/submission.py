@@ -0,0 +1,308 @@
+"""
+Scoring of single submissions (e.g. as a participant submits the form) in
+pure Python, without building data frames.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from functools import lru_cache
+
+from questionnaire_reader.bfi import BFI, BFI_QUESTIONS, REVERSED_SCORING
+from questionnaire_reader.bfi import REPLACE_DICT as BFI_REPLACE_DICT
+from questionnaire_reader.defaults import COLUMNS, REPLACE_DICT
+from questionnaire_reader.psqi import (
+    COMPONENT_2_EDGES,
+    COMPONENT_5_EDGES,
+    COMPONENT_7_EDGES,
+    MINUTES_PER_DAY,
+    SLEEP_EFFICIENCY_EDGES,
+    TIME_FORMATS,
+    PsqiQuestions,
+)
+from questionnaire_reader.psqi import REPLACE_DICT as PSQI_REPLACE_DICT
+from questionnaire_reader.schema import SCHEMA, Schema
+from questionnaire_reader.shs import SHS_NORMAL_SCORING, SHS_REVERSED_SCORING
+
+NAN = float("nan")
+ATTENTION = "Attention Deficit Disorder"
+ATTENTION_DUPLICATE = "Attention Deficit Disorder (1)"
+PSQI_FREQUENCIES = ("5a", "5b", "5c", "5d", "5e", "5f", "5g", "5h", "5i")
+
+
+def is_missing(value) -> bool:
+    try:
+        return value is None or bool(value != value)
+    except TypeError:
+        # pd.NA refuses to be converted to a boolean.
+        return True
+
+
+def to_float(value) -> float:
+    """
+    Convert a numeric response to a float, with NaN for missing or
+    unparsable responses (like :func:`pandas.to_numeric`'s "coerce").
+    """
+    if is_missing(value):
+        return NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+def nan_sum(values: list) -> float:
+    return sum(value for value in values if value == value)
+
+
+def nan_mean(values: list) -> float:
+    values = [value for value in values if value == value]
+    return sum(values) / len(values) if values else NAN
+
+
+def bin_score(score: float, edges: tuple) -> int:
+    """
+    Scalar counterpart of :func:`~questionnaire_reader.psqi.bin_scores`,
+    with right-inclusive bins and NaN sorted into the last bin.
+    """
+    if score != score:
+        return len(edges)
+    return bisect_left(edges, score)
+
+
+@lru_cache(maxsize=4096)
+def parse_time(text: str) -> int:
+    """
+    Parse a clock time into minutes since midnight, or -1 if it cannot be
+    parsed with any of :data:`~questionnaire_reader.psqi.TIME_FORMATS`.
+    """
+    for time_format in TIME_FORMATS:
+        try:
+            parsed = datetime.strptime(text, time_format)
+        except ValueError:
+            continue
+        return parsed.hour * 60 + parsed.minute
+    return -1
+
+
+def get_minutes(value) -> int:
+    return -1 if is_missing(value) else parse_time(str(value))
+
+
+class SubmissionScorer:
+    """
+    Cleans and scores one submission at a time the same way as
+    :meth:`~questionnaire_reader.QuestionnaireReader.clean_data` does a
+    whole dataset, using lookup tables compiled once from the translation
+    dictionaries.
+
+    Parameters
+    ----------
+    schema : Schema, optional
+        Column layout, by default
+        :data:`~questionnaire_reader.schema.SCHEMA`
+    replace_dict : dict, optional
+        Translations by column name, by default
+        :data:`~questionnaire_reader.defaults.REPLACE_DICT`
+    height_name : str, optional
+        Name of the height column, by default "Height (cm)"
+    """
+
+    def __init__(
+        self,
+        schema: Schema = SCHEMA,
+        replace_dict: dict = REPLACE_DICT,
+        height_name: str = COLUMNS["height"],
+    ):
+        self.height_name = height_name
+        # Each response maps to its translation, and translated responses to
+        # themselves, so that translating is a single lookup.
+        self.translations = {
+            name: {
+                **{value: value for value in mapping.values()},
+                **mapping,
+            }
+            for name, mapping in replace_dict.items()
+            if name in schema.index
+        }
+        scored = set()
+        for names in schema.instrument_names.values():
+            scored.update(names)
+        dropped = scored | {ATTENTION_DUPLICATE}
+        self.fields = tuple(
+            name for name in schema.names if name not in dropped
+        )
+        self.combine_attention = (
+            ATTENTION in schema.index and ATTENTION_DUPLICATE in schema.index
+        )
+        self.bfi_names = schema.instrument_names["bfi"]
+        self.reversed = frozenset(REVERSED_SCORING)
+        self.traits = tuple(
+            (trait.value, tuple(BFI_QUESTIONS[trait])) for trait in BFI
+        )
+        self.psqi_names = {
+            PsqiQuestions[f"PSQI_{i}"].value: name
+            for i, name in enumerate(schema.instrument_names["psqi"])
+        }
+
+    def __call__(self, record: dict) -> dict:
+        return self.score(record)
+
+    def translate(self, name: str, value):
+        if is_missing(value):
+            return "N/A"
+        try:
+            return self.translations[name].get(value, "N/A")
+        except TypeError:
+            return "N/A"
+
+    def get_height(self, value) -> float:
+        height = to_float(value)
+        return height * 100 if height < 3 else height
+
+    def clean(self, record: dict) -> dict:
+        """
+        Clean the non-instrument fields of *record*: fix heights, translate
+        responses, marking unknown or missing ones as "N/A", and merge the
+        duplicated attention deficit question.
+        """
+        clean = {}
+        translations = self.translations
+        for name in self.fields:
+            value = record.get(name)
+            if name in translations:
+                value = self.translate(name, value)
+            elif name == self.height_name:
+                value = self.get_height(value)
+            clean[name] = value
+        if self.combine_attention and is_missing(clean[ATTENTION]):
+            duplicate = record.get(ATTENTION_DUPLICATE)
+            if ATTENTION_DUPLICATE in translations:
+                duplicate = self.translate(ATTENTION_DUPLICATE, duplicate)
+            clean[ATTENTION] = duplicate
+        return clean
+
+    def get_code(self, mapping: dict, name: str, record: dict) -> float:
+        value = record.get(name)
+        if is_missing(value):
+            return NAN
+        try:
+            return float(mapping.get(value, value))
+        except (TypeError, ValueError) as exception:
+            message = f"Unknown response to {name!r}: {value!r}"
+            raise ValueError(message) from exception
+
+    def score_bfi(self, record: dict) -> dict:
+        responses = []
+        for i, name in enumerate(self.bfi_names):
+            response = self.get_code(BFI_REPLACE_DICT, name, record)
+            responses.append(6 - response if i in self.reversed else response)
+        return {
+            trait: nan_mean([responses[i] for i in questions])
+            for trait, questions in self.traits
+        }
+
+    def get_psqi_code(self, question: str, record: dict) -> float:
+        mapping = PSQI_REPLACE_DICT.get(f"Q_{question}", {})
+        return self.get_code(mapping, self.psqi_names[question], record)
+
+    def score_psqi(self, record: dict) -> float:
+        names = self.psqi_names
+        latency = to_float(record.get(names["2"]))
+        hours = to_float(record.get(names["4"]))
+        bedtime = get_minutes(record.get(names["1"]))
+        wakeup = get_minutes(record.get(names["3"]))
+        minutes_in_bed = (wakeup - bedtime) % MINUTES_PER_DAY
+        if bedtime < 0 or wakeup < 0 or hours != hours or not minutes_in_bed:
+            efficiency = NAN
+        else:
+            efficiency = 3 - bisect_right(
+                SLEEP_EFFICIENCY_EDGES, hours * 60 / minutes_in_bed
+            )
+        if latency <= 15:
+            latency = 0
+        elif latency <= 30:
+            latency = 1
+        elif latency <= 60:
+            latency = 2
+        else:
+            latency = 3
+        if hours > 7:
+            duration = 0
+        elif hours >= 6:
+            duration = 1
+        elif hours >= 5:
+            duration = 2
+        else:
+            duration = 3
+        frequencies = [
+            self.get_psqi_code(question, record)
+            for question in PSQI_FREQUENCIES
+        ]
+        onset = latency + frequencies[0]
+        components = [
+            self.get_psqi_code("6", record),
+            NAN if onset != onset else bin_score(onset, COMPONENT_2_EDGES),
+            duration,
+            efficiency,
+            bin_score(nan_sum(frequencies), COMPONENT_5_EDGES),
+            self.get_psqi_code("7", record),
+            bin_score(
+                nan_sum(
+                    [
+                        self.get_psqi_code("8", record),
+                        self.get_psqi_code("9", record),
+                    ]
+                ),
+                COMPONENT_7_EDGES,
+            ),
+        ]
+        return float(nan_sum(components))
+
+    def score_shs(self, record: dict) -> float:
+        responses = [to_float(record.get(name)) for name in SHS_NORMAL_SCORING]
+        responses += [
+            8 - to_float(record.get(name)) for name in SHS_REVERSED_SCORING
+        ]
+        return nan_mean(responses)
+
+    def score(self, record: dict) -> dict:
+        """
+        Clean and score a single submission.
+
+        Parameters
+        ----------
+        record : dict
+            Raw responses by column name; missing keys are treated as
+            missing responses
+
+        Returns
+        -------
+        dict
+            Clean fields and BFI trait, PSQI and SHS scores, in the column
+            order of :meth:`~questionnaire_reader.QuestionnaireReader.data`
+
+        Raises
+        ------
+        ValueError
+            If a BFI or PSQI response is neither a known response nor a
+            score
+        """
+        result = self.clean(record)
+        result.update(self.score_bfi(record))
+        result["PSQI"] = self.score_psqi(record)
+        result["SHS"] = self.score_shs(record)
+        return result
+
+
+_scorer = None
+
+
+def score_submission(record: dict) -> dict:
+    """
+    Clean and score a single submission with the default schema and
+    translations; see :meth:`SubmissionScorer.score`.
+    """
+    global _scorer
+    if _scorer is None:
+        _scorer = SubmissionScorer()
+    return _scorer.score(record)
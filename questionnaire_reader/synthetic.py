@@ -0,0 +1,179 @@
+"""
+Synthetic questionnaire exports for load testing and benchmarks.
+
+The generated exports follow the :data:`~questionnaire_reader.defaults.NAMES`
+column layout, with Hebrew responses drawn from the vocabularies the reader
+translates and scores.
+"""
+
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from questionnaire_reader import bfi, psqi
+from questionnaire_reader.defaults import NAMES, PSQI_NAMES, REPLACE_DICT
+from questionnaire_reader.writers import write_chunks
+
+CHUNK_SIZE = 50_000
+INVALID_RESPONSE = "תשובה לא צפויה"
+START_TIME = pd.Timestamp("2020-01-01")
+NUMBERS = {
+    "Age (years)": (18, 80),
+    "Weight (kg)": (45, 120),
+    "Number of Siblings": (0, 8),
+    "Number of Children": (0, 6),
+    "Cups of Coffee per Day": (0, 6),
+    "Cups of Water per Day": (0, 12),
+}
+PSQI_COLUMNS = {
+    name: f"Q_{question.value}"
+    for name, question in zip(PSQI_NAMES, psqi.PsqiQuestions)
+}
+
+
+def get_choices(name: str) -> list:
+    if name in REPLACE_DICT:
+        return list(REPLACE_DICT[name])
+    question = PSQI_COLUMNS.get(name)
+    if question in psqi.REPLACE_DICT:
+        return list(psqi.REPLACE_DICT[question])
+    if name.startswith("BFI"):
+        return list(bfi.REPLACE_DICT)
+    return None
+
+
+def format_times(minutes: np.ndarray) -> np.ndarray:
+    times = START_TIME + pd.to_timedelta(minutes % (24 * 60), unit="min")
+    return times.strftime("%I:%M:%S %p").to_numpy(dtype=object)
+
+
+def generate_sleep_responses(rng: np.random.Generator, n_rows: int) -> dict:
+    bedtime = rng.integers(21 * 12, 26 * 12, n_rows) * 5
+    minutes_in_bed = rng.integers(5 * 12, 10 * 12, n_rows) * 5
+    latency = rng.choice([5, 10, 15, 20, 30, 45, 60, 90], n_rows)
+    hours = np.maximum(minutes_in_bed - latency, 60) / 60
+    return {
+        "Bedtime": format_times(bedtime),
+        "Time Until Falling Asleep (minutes)": latency,
+        "Wakeup Time": format_times(bedtime + minutes_in_bed),
+        "Hours of Sleep": np.round(hours * 2) / 2,
+    }
+
+
+def generate_responses(
+    n_rows: int,
+    seed: int = 0,
+    missing_rate: float = 0.0,
+    invalid_rate: float = 0.0,
+    metres_rate: float = 0.1,
+    start: int = 0,
+) -> pd.DataFrame:
+    """
+    Generate synthetic questionnaire responses.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of subjects
+    seed : int, optional
+        Random seed, by default 0
+    missing_rate : float, optional
+        Fraction of missing responses to translated or scored questions
+    invalid_rate : float, optional
+        Fraction of unknown responses to translated questions (scored
+        questions only get valid or missing responses, as the scorers
+        reject unknown ones)
+    metres_rate : float, optional
+        Fraction of heights reported in metres rather than centimetres
+    start : int, optional
+        Index of the first subject, used for subject IDs and timestamps
+
+    Returns
+    -------
+    pd.DataFrame
+        Synthetic responses, with columns named by
+        :data:`~questionnaire_reader.defaults.NAMES`
+    """
+    rng = np.random.default_rng([seed, start])
+    sleep = generate_sleep_responses(rng, n_rows)
+    columns = {}
+    for name in NAMES:
+        choices = get_choices(name)
+        if choices is not None:
+            values = rng.choice(np.array(choices, dtype=object), n_rows)
+            noise = rng.random(n_rows)
+            if name in REPLACE_DICT:
+                values[noise < invalid_rate] = INVALID_RESPONSE
+            values[noise > 1 - missing_rate] = None
+            columns[name] = values
+        elif name in sleep:
+            columns[name] = sleep[name]
+        elif name.startswith("SHS"):
+            columns[name] = rng.integers(1, 8, n_rows)
+        elif name in NUMBERS:
+            columns[name] = rng.integers(*NUMBERS[name], n_rows)
+        else:
+            columns[name] = np.full(n_rows, np.nan)
+    subjects = np.arange(start, start + n_rows)
+    columns["Timestamp"] = START_TIME + pd.to_timedelta(subjects, unit="h")
+    columns["Subject ID"] = subjects
+    height = rng.normal(170, 10, n_rows).round()
+    in_metres = rng.random(n_rows) < metres_rate
+    columns["Height (cm)"] = np.where(in_metres, height / 100, height)
+    return pd.DataFrame(columns, index=subjects)
+
+
+def generate_chunks(
+    n_rows: int, chunksize: int = CHUNK_SIZE, **kwargs
+) -> Iterator[pd.DataFrame]:
+    """
+    Generate synthetic questionnaire responses in chunks of at most
+    *chunksize* rows.
+
+    Parameters
+    ----------
+    n_rows : int
+        Total number of subjects
+    chunksize : int, optional
+        Maximal number of subjects per chunk
+    kwargs
+        Passed to :func:`generate_responses`
+
+    Yields
+    ------
+    pd.DataFrame
+        Synthetic responses
+    """
+    for start in range(0, n_rows, chunksize):
+        size = min(chunksize, n_rows - start)
+        yield generate_responses(size, start=start, **kwargs)
+
+
+def write_export(
+    path: str,
+    n_rows: int,
+    file_format: str = None,
+    chunksize: int = CHUNK_SIZE,
+    **kwargs,
+) -> None:
+    """
+    Write a synthetic questionnaire export, generating it chunk by chunk so
+    that memory use does not depend on *n_rows*.
+
+    Parameters
+    ----------
+    path : str
+        Output path
+    n_rows : int
+        Number of subjects
+    file_format : str, optional
+        One of "csv", "parquet", "feather" or "excel", by default detected
+        from *path*'s extension
+    chunksize : int, optional
+        Maximal number of subjects generated at once
+    kwargs
+        Passed to :func:`generate_responses`
+    """
+    chunks = generate_chunks(n_rows, chunksize=chunksize, **kwargs)
+    write_chunks(path, chunks, file_format=file_format)
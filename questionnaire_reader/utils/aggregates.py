@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from typing import Callable
+
+import pandas as pd
+
+MAX_SIZE = 256
+
+
+class AggregateCache:
+    """
+    Least-recently-used cache of per-column aggregates (value counts, NaN
+    counts and summaries) of a dataset.
+
+    The cache is bound to a single dataset object; binding it to another one
+    (see :meth:`bind`) clears it, so replacing a reader's clean data (e.g.
+    when refreshing it) invalidates the aggregates. Datasets modified in
+    place must be passed to :meth:`clear` explicitly.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        Maximal number of aggregates kept, by default 256
+    """
+
+    def __init__(self, max_size: int = MAX_SIZE):
+        self.max_size = max_size
+        self.data = None
+        self.entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def bind(self, data: pd.DataFrame) -> "AggregateCache":
+        if data is not self.data:
+            self.clear()
+            self.data = data
+        return self
+
+    def get(self, column_name: str, kind: str, compute: Callable):
+        key = (column_name, kind)
+        try:
+            value = self.entries[key]
+        except KeyError:
+            value = compute(self.data[column_name])
+            self.entries[key] = value
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        return value
+
+    def value_counts(self, column_name: str) -> pd.Series:
+        return self.get(column_name, "value_counts", pd.Series.value_counts)
+
+    def sorted_counts(self, column_name: str) -> pd.Series:
+        return self.get(
+            column_name,
+            "sorted_counts",
+            lambda _: self.value_counts(column_name).sort_index(),
+        )
+
+    def na_count(self, column_name: str) -> int:
+        return self.get(
+            column_name, "na_count", lambda column: int(column.isna().sum())
+        )
+
+    def summary(self, column_name: str) -> pd.Series:
+        return self.get(column_name, "summary", pd.Series.describe)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+
+def downcast(series: pd.Series) -> pd.Series:
+    """
+    Downcast a numeric series to the smallest dtype that represents all of
+    its values exactly.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Numeric series
+
+    Returns
+    -------
+    pd.Series
+        Downcast series
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    values = series.to_numpy()
+    if not np.isnan(values).any() and np.array_equal(values, np.round(values)):
+        return pd.to_numeric(series, downcast="integer")
+    single = values.astype(np.float32)
+    if np.array_equal(single, values, equal_nan=True):
+        return series.astype(np.float32)
+    return series
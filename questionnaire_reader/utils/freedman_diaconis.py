@@ -1,10 +1,28 @@
+from typing import Iterable
+
 import numpy as np
-from scipy import stats
+
+from questionnaire_reader.utils.quantile_sketch import (
+    DEFAULT_K,
+    QuantileSketch,
+)
+
+
+def get_bin_count(iqr: float, size: int, data_range: float) -> int:
+    """
+    Freedman Diaconis bin count for a sample of *size* values with the given
+    interquartile range and range, at least 1.
+    """
+    bw = (2 * iqr) / np.power(size, 1 / 3)
+    if not bw > 0:
+        return 1
+    return int((data_range / bw) + 1)
 
 
 def freedman_diaconis(data) -> int:
     """
     Use Freedman Diaconis rule to compute optimal number of histogram bins.
+    NaNs are ignored.
 
 
     Parameters
@@ -13,10 +31,53 @@ def freedman_diaconis(data) -> int:
         One-dimensional array.
     """
 
-    data = np.asarray(data, dtype=np.float_)
-    IQR = stats.iqr(data, rng=(25, 75), scale=1.0, nan_policy="omit")
-    N = data.size
-    bw = (2 * IQR) / np.power(N, 1 / 3)
-    datmin, datmax = data.min(), data.max()
-    datrng = datmax - datmin
-    return int((datrng / bw) + 1)
+    data = np.asarray(data, dtype=np.float64)
+    data = data[~np.isnan(data)]
+    if not data.size:
+        return 1
+    q25, q75 = np.percentile(data, [25, 75])
+    return get_bin_count(q75 - q25, data.size, data.max() - data.min())
+
+
+def sketch_chunks(chunks: Iterable, k: int = DEFAULT_K) -> QuantileSketch:
+    """
+    Summarize an iterable of one-dimensional chunks in a single pass.
+    """
+    sketch = QuantileSketch(k=k)
+    for chunk in chunks:
+        sketch.update(chunk)
+    return sketch
+
+
+def freedman_diaconis_sketch(sketch: QuantileSketch) -> int:
+    """
+    Freedman Diaconis bin count estimated from a quantile sketch, which may
+    be the merge of sketches of several chunks or columns.
+    """
+    if not sketch.count:
+        return 1
+    q25, q75 = sketch.quantile([0.25, 0.75])
+    return get_bin_count(q75 - q25, sketch.count, sketch.max - sketch.min)
+
+
+def freedman_diaconis_chunked(chunks: Iterable, k: int = DEFAULT_K) -> int:
+    """
+    Use Freedman Diaconis rule to compute the number of histogram bins of a
+    column too large to hold in memory, in one pass over its chunks and in
+    memory bounded by the sketch size *k*.
+
+    Parameters
+    ----------
+    chunks : Iterable
+        One-dimensional chunks of the column (arrays or series), e.g. read
+        with :func:`pandas.read_csv`'s *chunksize*; NaNs are ignored
+    k : int, optional
+        Quantile sketch size (see
+        :class:`~questionnaire_reader.utils.quantile_sketch.QuantileSketch`)
+
+    Returns
+    -------
+    int
+        Number of bins
+    """
+    return freedman_diaconis_sketch(sketch_chunks(chunks, k=k))
@@ -0,0 +1,122 @@
+from typing import List
+
+import numpy as np
+
+DEFAULT_K = 512
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch (after Karnin, Lang and Liberty's KLL sketch)
+    with an exact running count, minimum and maximum.
+
+    Values are kept in compactors of increasing weight; a full compactor is
+    sorted and every other value (starting at a random offset) is promoted
+    to the next one with twice the weight, so memory grows with
+    ``k * log(n / k)`` rather than with the number of values *n*, and the
+    rank error of quantiles is in the order of ``1 / k``.
+
+    Parameters
+    ----------
+    k : int, optional
+        Capacity of the top compactor, trading memory for accuracy, by
+        default 512
+    seed : int, optional
+        Random seed for compaction offsets, by default 0
+    """
+
+    def __init__(self, k: int = DEFAULT_K, seed: int = 0):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.compactors: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def compress(self) -> None:
+        level = 0
+        while level < len(self.compactors):
+            values = self.compactors[level]
+            if values.size > self.get_capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                values = np.sort(values)
+                # Keep an odd value out so that the halving is exact.
+                kept = values[: values.size % 2]
+                paired = values[values.size % 2 :]
+                promoted = paired[self.rng.integers(2) :: 2]
+                self.compactors[level] = kept
+                self.compactors[level + 1] = np.concatenate(
+                    [self.compactors[level + 1], promoted]
+                )
+            level += 1
+
+    def update(self, values) -> "QuantileSketch":
+        """
+        Add values, ignoring NaNs.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.count += values.size
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+            self.compactors[0] = np.concatenate([self.compactors[0], values])
+            self.compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Add the values summarized by another sketch.
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, values in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate(
+                [self.compactors[level], values]
+            )
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+        return self
+
+    def quantile(self, q):
+        """
+        Estimate quantiles, interpolating between sketched values like
+        :func:`numpy.quantile`'s default method.
+
+        Parameters
+        ----------
+        q : float or array-like
+            Quantiles, between 0 and 1
+
+        Returns
+        -------
+        float or np.ndarray
+            Estimated quantiles, NaN if no values were added
+        """
+        if not self.count:
+            return np.full(np.shape(q), np.nan)[()]
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate(
+            [
+                np.full(compactor.size, 2.0**level)
+                for level, compactor in enumerate(self.compactors)
+            ]
+        )
+        order = np.argsort(values)
+        values, weights = values[order], weights[order]
+        # The extremes may have been compacted away, but are known exactly.
+        values[0], values[-1] = self.min, self.max
+        # Weighted ranks of each value's centre, mapped to [0, 1].
+        ranks = np.cumsum(weights) - weights / 2
+        ranks = (ranks - ranks[0]) / max(ranks[-1] - ranks[0], 1)
+        return np.interp(q, ranks, values)
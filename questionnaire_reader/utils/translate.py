@@ -0,0 +1,51 @@
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def translate(
+    responses: pd.Series, mapping: dict, default: str = "N/A"
+) -> Tuple[np.ndarray, pd.Series]:
+    """
+    Translate responses through *mapping*, looking up each distinct response
+    only once.
+
+    Responses that are already translated (i.e. are values of *mapping*) are
+    kept as they are, and any other response, including missing ones, is
+    replaced by *default*.
+
+    Parameters
+    ----------
+    responses : pd.Series
+        Raw responses
+    mapping : dict
+        Translation of each known response
+    default : str, optional
+        Value for unknown or missing responses, by default "N/A"
+
+    Returns
+    -------
+    Tuple[np.ndarray, pd.Series]
+        Translated responses, and the number of occurrences of each unknown
+        response
+    """
+    codes, uniques = pd.factorize(responses)
+    translated_values = set(mapping.values())
+    translated = []
+    unseen = []
+    for i, response in enumerate(uniques):
+        if response in mapping:
+            translated.append(mapping[response])
+        elif response in translated_values:
+            translated.append(response)
+        else:
+            translated.append(default)
+            unseen.append(i)
+    translated.append(default)
+    translated = np.array(translated, dtype=object)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    unseen_counts = pd.Series(
+        counts[unseen], index=pd.Index(uniques.take(unseen), dtype=object)
+    )
+    return translated[codes], unseen_counts
@@ -0,0 +1,160 @@
+"""
+Writers appending a stream of data frames to a single file.
+"""
+
+import os
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from questionnaire_reader.readers import EXTENSIONS
+
+
+def get_sink_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    return EXTENSIONS.get(extension, "csv")
+
+
+def write_csv(path: str, chunks: Iterator[pd.DataFrame]) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(fh, header=i == 0, index=False)
+
+
+def promote_schema(schema, empty: Iterable[str] = ()):
+    """
+    Widen a chunk's Arrow schema so that later chunks, whose columns pandas
+    may have inferred differently, can be converted to it: numbers become
+    doubles, and columns with no values (including the *empty* columns,
+    which pandas reads as all-NaN floats) become nullable strings, since
+    free-text answers may only appear in later chunks.
+    """
+    import pyarrow as pa
+
+    empty = set(empty)
+    fields = []
+    for field in schema:
+        kind = field.type
+        if pa.types.is_null(kind) or field.name in empty:
+            field = field.with_type(pa.string())
+        elif pa.types.is_integer(kind) or pa.types.is_floating(kind):
+            field = field.with_type(pa.float64())
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def conform(chunk: pd.DataFrame, schema) -> pd.DataFrame:
+    """
+    Convert *chunk*'s columns to the types of a promoted schema.
+    """
+    import pyarrow as pa
+
+    chunk = chunk.copy()
+    for field in schema:
+        column = chunk[field.name]
+        if pa.types.is_string(field.type):
+            chunk[field.name] = column.astype("string")
+        elif pa.types.is_float64(field.type):
+            try:
+                chunk[field.name] = pd.to_numeric(column).astype(float)
+            except (TypeError, ValueError) as exception:
+                message = (
+                    f"Column {field.name!r} changed from numbers to text "
+                    "between chunks; write to CSV instead"
+                )
+                raise ValueError(message) from exception
+    return chunk
+
+
+def write_arrow(
+    path: str,
+    chunks: Iterator[pd.DataFrame],
+    file_format: str,
+    promote: bool = False,
+) -> None:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                if promote:
+                    empty = chunk.columns[chunk.isna().all().to_numpy()]
+                    schema = promote_schema(schema, empty)
+                if file_format == "parquet":
+                    writer = pq.ParquetWriter(path, schema)
+                else:
+                    writer = ipc.new_file(path, schema)
+            if promote:
+                chunk = conform(chunk, schema)
+            table = pa.Table.from_pandas(
+                chunk, schema=schema, preserve_index=False
+            )
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_excel(path: str, chunks: Iterator[pd.DataFrame]) -> None:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            sheet.append(list(chunk.columns))
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False):
+            sheet.append(row)
+    workbook.save(path)
+
+
+def write_chunks(
+    path: str,
+    chunks: Iterator[pd.DataFrame],
+    file_format: str = None,
+    promote: bool = False,
+) -> None:
+    """
+    Write a stream of data frames with the same columns to a single file,
+    holding only one of them in memory at a time.
+
+    Parameters
+    ----------
+    path : str
+        Output path
+    chunks : Iterator[pd.DataFrame]
+        Data frames to write, in order
+    file_format : str, optional
+        One of "csv", "parquet", "feather" or "excel", by default detected
+        from *path*'s extension
+    promote : bool, optional
+        Whether to widen the Parquet or Feather schema inferred from the
+        first chunk (see :func:`promote_schema`) and convert later chunks to
+        it, for chunks whose types pandas inferred independently
+
+    Raises
+    ------
+    ValueError
+        If a chunk cannot be converted to the file's schema, in which case
+        *path* is removed
+    """
+    file_format = file_format or get_sink_format(path)
+    if file_format not in ("csv", "parquet", "feather", "excel"):
+        raise ValueError(f"Unsupported format: {file_format}")
+    try:
+        if file_format == "csv":
+            write_csv(path, chunks)
+        elif file_format == "excel":
+            write_excel(path, chunks)
+        else:
+            write_arrow(path, chunks, file_format, promote=promote)
+    except BaseException:
+        # Do not leave a truncated file behind.
+        if os.path.exists(path):
+            os.remove(path)
+        raise
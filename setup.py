@@ -1,5 +1,8 @@
 from setuptools import find_packages, setup
 
+about = {}
+with open("questionnaire_reader/version.py") as fh:
+    exec(fh.read(), about)
 
 with open("README.md", "r") as fh:
     long_description = fh.read()
@@ -22,7 +25,7 @@ with open("requirements-dev.txt") as fh:
 
 setup(
     name="questionnaire_reader",
-    version="0.1.0",
+    version=about["__version__"],
     packages=find_packages(),
     include_package_data=True,
     scripts=[],
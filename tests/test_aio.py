@@ -0,0 +1,129 @@
+import asyncio
+import functools
+import http.server
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.synthetic import write_export
+
+FORMATS = ("csv", "parquet", "xlsx")
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+class StalledHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Starts sending a response, then stalls until :attr:`release` is set.
+    """
+
+    release = threading.Event()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(1 << 20))
+        self.end_headers()
+        self.wfile.write(b"Timestamp,")
+        self.wfile.flush()
+        self.release.wait(10)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(handler) -> http.server.ThreadingHTTPServer:
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def get_url(server, name: str) -> str:
+    return f"http://127.0.0.1:{server.server_port}/{name}"
+
+
+@pytest.fixture(scope="module")
+def exports(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("exports")
+    for file_format in FORMATS:
+        write_export(str(directory / f"export.{file_format}"), 40)
+    handler = functools.partial(QuietHandler, directory=str(directory))
+    server = serve(handler)
+    yield directory, server
+    server.shutdown()
+
+
+@pytest.fixture
+def stalled_server():
+    StalledHandler.release.clear()
+    server = serve(StalledHandler)
+    yield server
+    StalledHandler.release.set()
+    server.shutdown()
+
+
+def test_concurrent_loads_match_local_reads(exports):
+    directory, server = exports
+
+    async def load_all():
+        urls = [get_url(server, f"export.{name}") for name in FORMATS]
+        return await asyncio.gather(
+            *[QuestionnaireReader.aload(url) for url in urls]
+        )
+
+    readers = asyncio.run(load_all())
+    for reader, file_format in zip(readers, FORMATS):
+        local = QuestionnaireReader(str(directory / f"export.{file_format}"))
+        pd.testing.assert_frame_equal(reader.data, local.data)
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_url_is_downloaded_once(exports, file_format):
+    directory, server = exports
+    name = f"export.{file_format}"
+    QuietHandler.requests.clear()
+    reader = QuestionnaireReader(get_url(server, name))
+    local = QuestionnaireReader(str(directory / name))
+    pd.testing.assert_frame_equal(reader.data, local.data)
+    assert QuietHandler.requests == [f"/{name}"]
+
+
+def test_cancelled_download_returns_promptly(stalled_server):
+    async def cancel_load():
+        url = get_url(stalled_server, "export.csv")
+        task = asyncio.create_task(QuestionnaireReader.aload(url))
+        await asyncio.sleep(0.2)
+        start = time.perf_counter()
+        task.cancel()
+        try:
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return time.perf_counter() - start
+        finally:
+            # Let the executor thread finish so that the loop can close.
+            StalledHandler.release.set()
+
+    assert asyncio.run(cancel_load()) < 1
+
+
+def test_stalled_download_times_out(stalled_server):
+    async def load():
+        url = get_url(stalled_server, "export.csv")
+        return await QuestionnaireReader.aload(url, timeout=0.2)
+
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        asyncio.run(load())
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,118 @@
+import pandas as pd
+import pytest
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.synthetic import write_export
+
+N_ROWS = 60
+N_READ = 40
+
+
+def as_objects(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype(object).where(df.notna(), None)
+
+
+@pytest.fixture
+def export(tmp_path) -> pd.DataFrame:
+    path = str(tmp_path / "full.csv")
+    write_export(path, N_ROWS, missing_rate=0.1, invalid_rate=0.05)
+    return pd.read_csv(path)
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "export.csv")
+
+
+def write(export: pd.DataFrame, path: str, n_rows: int = N_ROWS) -> None:
+    export.iloc[:n_rows].to_csv(path, index=False)
+
+
+def assert_matches_rebuild(reader: QuestionnaireReader):
+    rebuilt = QuestionnaireReader(reader.path)
+    pd.testing.assert_frame_equal(reader.raw, rebuilt.raw)
+    pd.testing.assert_frame_equal(reader.data, rebuilt.data)
+    pd.testing.assert_series_equal(
+        reader.invalid_sleep_times, rebuilt.invalid_sleep_times
+    )
+    assert set(reader.unseen_responses) == set(rebuilt.unseen_responses)
+    for key, unseen in rebuilt.unseen_responses.items():
+        pd.testing.assert_series_equal(
+            reader.unseen_responses[key].sort_index(),
+            unseen.sort_index(),
+            check_dtype=False,
+        )
+
+
+def test_refresh_matches_rebuild(export, path):
+    write(export, path, N_READ)
+    reader = QuestionnaireReader(path)
+    reader.compute()
+    write(export, path)
+    new = reader.refresh()
+    assert list(new.index) == list(range(N_READ, N_ROWS))
+    assert_matches_rebuild(reader)
+    assert reader.refresh().empty
+
+
+def test_refresh_keeps_timestamp_ties(export, path):
+    timestamp = export.loc[N_READ - 1, "Timestamp"]
+    export.loc[N_READ, "Timestamp"] = timestamp
+    export.loc[N_READ + 1, "Timestamp"] = None
+    write(export, path, N_READ)
+    reader = QuestionnaireReader(path)
+    reader.compute()
+    write(export, path)
+    assert len(reader.refresh()) == N_ROWS - N_READ
+    assert_matches_rebuild(reader)
+
+
+def test_refresh_without_timestamps(export, path):
+    export["Timestamp"] = None
+    write(export, path, N_READ)
+    reader = QuestionnaireReader(path)
+    reader.compute()
+    write(export, path)
+    assert len(reader.refresh()) == N_ROWS - N_READ
+    assert_matches_rebuild(reader)
+
+
+@pytest.mark.parametrize("n_rows", [N_READ, N_ROWS])
+def test_refresh_rebuilds_edited_history(tmp_path, export, path, n_rows):
+    cache_dir = str(tmp_path / "cache")
+    write(export, path, N_READ)
+    reader = QuestionnaireReader(path, cache_dir=cache_dir)
+    reader.compute()
+    export.loc[5, "Height (cm)"] = 111
+    write(export, path, n_rows)
+    changed = reader.refresh()
+    assert list(changed.index) == [5, *range(N_READ, n_rows)]
+    assert reader.data.loc[5, "Height (cm)"] == 111
+    assert_matches_rebuild(reader)
+    cached = QuestionnaireReader(path, cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(
+        as_objects(cached.data), as_objects(reader.data)
+    )
+
+
+def test_refresh_after_cache_hit(tmp_path, export, path):
+    cache_dir = str(tmp_path / "cache")
+    write(export, path, N_READ)
+    QuestionnaireReader(path, cache_dir=cache_dir).compute()
+    reader = QuestionnaireReader(path, cache_dir=cache_dir)
+    reader.compute()
+    write(export, path)
+    assert len(reader.refresh()) == N_ROWS - N_READ
+    cached = QuestionnaireReader(path, cache_dir=cache_dir)
+    assert len(cached.data) == N_ROWS
+
+
+def test_append_skips_rows_already_read(tmp_path, export, path):
+    write(export, path, N_READ)
+    reader = QuestionnaireReader(path)
+    reader.compute()
+    other = str(tmp_path / "other.csv")
+    export.iloc[N_READ - 10 :].to_csv(other, index=False)
+    assert len(reader.append(other)) == N_ROWS - N_READ
+    write(export, path)
+    assert_matches_rebuild(reader)
@@ -0,0 +1,123 @@
+import os
+
+import pandas as pd
+import pytest
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.cache import read_cache, write_cache
+from questionnaire_reader.defaults import REPLACE_DICT
+from questionnaire_reader.synthetic import write_export
+
+
+def fail_reading(*args, **kwargs):
+    raise AssertionError("The source was read despite a cached entry")
+
+
+def as_objects(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype(object).where(df.notna(), None)
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    path = str(tmp_path / "export.csv")
+    write_export(path, 40, missing_rate=0.1, invalid_rate=0.05)
+    return path
+
+
+@pytest.fixture
+def cache_dir(tmp_path) -> str:
+    return str(tmp_path / "cache")
+
+
+def cache(path: str, cache_dir: str, **kwargs) -> QuestionnaireReader:
+    reader = QuestionnaireReader(path, cache_dir=cache_dir, **kwargs)
+    reader.compute()
+    return reader
+
+
+def is_cached(path: str, cache_dir: str, **kwargs) -> bool:
+    reader = QuestionnaireReader(path, cache_dir=cache_dir, **kwargs)
+    reader.read_data = fail_reading
+    try:
+        reader.load()
+    except AssertionError:
+        return False
+    return reader._data is not None
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_cache_hit(path, cache_dir, compact):
+    cold = cache(path, cache_dir, compact=compact)
+    warm = QuestionnaireReader(path, cache_dir=cache_dir, compact=compact)
+    warm.read_data = fail_reading
+    pd.testing.assert_frame_equal(warm.raw, cold.raw)
+    # Object columns come back as strings, with NaN for missing values.
+    pd.testing.assert_frame_equal(as_objects(warm.data), as_objects(cold.data))
+    assert list(warm.data.dtypes == "category") == list(
+        cold.data.dtypes == "category"
+    )
+
+
+def test_cache_hit_restores_diagnostics(path, cache_dir):
+    export = pd.read_csv(path)
+    export.loc[3, "Bedtime"] = "late"
+    export.to_csv(path, index=False)
+    cold = cache(path, cache_dir)
+    assert cold.unseen_responses
+    assert cold.invalid_sleep_times.sum() == 1
+    warm = QuestionnaireReader(path, cache_dir=cache_dir)
+    warm.read_data = fail_reading
+    warm.compute()
+    assert list(warm.unseen_responses) == list(cold.unseen_responses)
+    for key, unseen in cold.unseen_responses.items():
+        pd.testing.assert_series_equal(warm.unseen_responses[key], unseen)
+    pd.testing.assert_series_equal(
+        warm.invalid_sleep_times, cold.invalid_sleep_times
+    )
+
+
+def test_cache_entries_are_not_pickled(path, cache_dir):
+    cache(path, cache_dir)
+    for directory, _, files in os.walk(cache_dir):
+        for name in files:
+            with open(os.path.join(directory, name), "rb") as fh:
+                assert fh.read(4) == b"PAR1"
+
+
+def test_changed_file_misses(path, cache_dir):
+    cache(path, cache_dir)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write("\n")
+    assert not is_cached(path, cache_dir)
+
+
+def test_changed_replace_dict_misses(path, cache_dir):
+    cache(path, cache_dir)
+    replace_dict = {**REPLACE_DICT, "Sex": {"זכר": "M", "נקבה": "F"}}
+    assert is_cached(path, cache_dir)
+    assert not is_cached(path, cache_dir, replace_dict=replace_dict)
+
+
+def test_changed_compact_misses(path, cache_dir):
+    cache(path, cache_dir)
+    assert not is_cached(path, cache_dir, compact=True)
+
+
+def test_unreadable_entry_is_rebuilt(path, cache_dir):
+    reader = cache(path, cache_dir)
+    entry = os.path.join(cache_dir, reader.get_cache_key())
+    for name in os.listdir(entry):
+        with open(os.path.join(entry, name), "wb") as fh:
+            fh.write(b"not parquet")
+    assert not is_cached(path, cache_dir)
+    assert not os.path.exists(entry)
+    cache(path, cache_dir)
+    assert is_cached(path, cache_dir)
+
+
+def test_mixed_columns_are_stored_as_strings(cache_dir):
+    raw = pd.DataFrame({"mixed": [1, "two", None], "numbers": [1.0, 2, 3]})
+    write_cache(cache_dir, "key", raw, raw)
+    cached_raw = read_cache(cache_dir, "key").raw
+    assert list(cached_raw["mixed"].fillna("-")) == ["1", "two", "-"]
+    assert cached_raw["numbers"].dtype == float
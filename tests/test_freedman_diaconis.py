@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from questionnaire_reader.utils.freedman_diaconis import (
+    freedman_diaconis,
+    freedman_diaconis_chunked,
+)
+from questionnaire_reader.utils.quantile_sketch import QuantileSketch
+
+# Quantile rank error allowed with the default sketch size (k=512).
+RANK_ERROR = 0.01
+
+
+def freedman_diaconis_scipy(data) -> int:
+    # The scipy-based implementation freedman_diaconis replaced.
+    stats = pytest.importorskip("scipy.stats")
+    data = np.asarray(data, dtype=np.float64)
+    iqr = stats.iqr(data, rng=(25, 75), scale=1.0, nan_policy="omit")
+    bw = (2 * iqr) / np.power(data.size, 1 / 3)
+    return int(((data.max() - data.min()) / bw) + 1)
+
+
+def get_samples():
+    rng = np.random.default_rng(0)
+    return {
+        "normal": rng.normal(170, 10, 5_000),
+        "exponential": rng.exponential(2, 20_000),
+        "integers": rng.integers(0, 50, 3_000).astype(float),
+        "small": np.array([1.0, 2.0, 4.0, 8.0]),
+    }
+
+
+SAMPLES = get_samples()
+
+
+def get_rank_error(values: np.ndarray, sketch: QuantileSketch) -> float:
+    q = np.linspace(0, 1, 101)
+    ranks = np.searchsorted(np.sort(values), sketch.quantile(q))
+    return np.abs(ranks / values.size - q).max()
+
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_matches_scipy(name):
+    data = SAMPLES[name]
+    assert freedman_diaconis(data) == freedman_diaconis_scipy(data)
+
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_nans_are_ignored(name):
+    data = SAMPLES[name]
+    with_nans = np.insert(data, [0, data.size // 2, data.size], np.nan)
+    assert freedman_diaconis(with_nans) == freedman_diaconis(data)
+    assert freedman_diaconis_chunked([with_nans]) == freedman_diaconis_chunked(
+        [data]
+    )
+
+
+@pytest.mark.parametrize(
+    "data", [[], [np.nan, np.nan], [3.0, 3.0, 3.0]], ids=str
+)
+def test_degenerate_data_has_one_bin(data):
+    assert freedman_diaconis(data) == 1
+    assert freedman_diaconis_chunked([data]) == 1
+    assert freedman_diaconis_chunked([]) == 1
+
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_chunked_is_exact_below_sketch_size(name):
+    data = SAMPLES[name]
+    chunks = np.array_split(data, 4)
+    k = data.size + 1
+    assert freedman_diaconis_chunked(chunks, k=k) == freedman_diaconis(data)
+
+
+def test_empty_sketch():
+    sketch = QuantileSketch()
+    assert len(sketch) == 0
+    assert np.isnan(sketch.quantile(0.5))
+    assert np.isnan(sketch.quantile([0.25, 0.75])).all()
+    sketch.merge(QuantileSketch().update([np.nan]))
+    assert len(sketch) == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_merged_sketch_rank_error(seed):
+    rng = np.random.default_rng(seed)
+    first = rng.normal(size=100_000)
+    second = rng.exponential(3, size=150_000)
+    sketch = QuantileSketch(seed=seed)
+    for chunk in np.array_split(first, 7):
+        sketch.update(chunk)
+    sketch.merge(QuantileSketch(seed=seed + 1).update(second))
+    values = np.concatenate([first, second])
+    assert len(sketch) == values.size
+    assert sketch.min == values.min()
+    assert sketch.max == values.max()
+    assert get_rank_error(values, sketch) <= RANK_ERROR
+    assert sketch.quantile(0) == values.min()
+    assert sketch.quantile(1) == values.max()
@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+
+# Seconds; importing the package is dominated by pandas (about 0.35s), and
+# loading matplotlib again would take it to about 1.6s.
+IMPORT_TIME_BUDGET = 1.0
+HEAVY_MODULES = ("matplotlib", "scipy", "dotenv", "tkinter")
+SCRIPT = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import questionnaire_reader
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "modules": sorted(sys.modules)}))
+"""
+
+
+def import_in_subprocess() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def test_import_skips_heavy_modules():
+    modules = import_in_subprocess()["modules"]
+    loaded = [name for name in modules if name.split(".")[0] in HEAVY_MODULES]
+    assert not loaded
+
+
+def test_import_time_budget():
+    # The best of a few runs, to tolerate a busy machine.
+    seconds = min(import_in_subprocess()["seconds"] for _ in range(3))
+    assert seconds < IMPORT_TIME_BUDGET
@@ -0,0 +1,40 @@
+import threading
+
+import pandas as pd
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.pipeline import Stage, run_pipeline, select_stages
+from questionnaire_reader.synthetic import generate_responses
+
+
+def record_thread(threads: list, name: str):
+    def function(df: pd.DataFrame) -> pd.Series:
+        threads.append(threading.current_thread())
+        return df.sum(axis=1).rename(name)
+
+    return function
+
+
+def test_stages_run_sequentially_by_default():
+    threads = []
+    df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+    stages = [
+        Stage("first", record_thread(threads, "c"), ("a",), ("c",)),
+        Stage("second", record_thread(threads, "d"), ("b",), ("d",)),
+    ]
+    result = run_pipeline(df, stages)
+    assert threads == [threading.current_thread()] * 2
+    assert list(result.columns) == ["a", "b", "c", "d"]
+
+
+def test_select_stages_narrows_columnwise_stages():
+    stage = Stage("upper", None, ("a", "b"), ("a", "b"), columnwise=True)
+    (selected,) = select_stages([stage], ["b"])
+    assert selected.inputs == selected.outputs == ("b",)
+
+
+def test_threads_match_sequential_run():
+    df = generate_responses(50, missing_rate=0.1)
+    sequential = QuestionnaireReader(path="unused.csv").clean_data(df)
+    threaded = QuestionnaireReader(path="unused.csv", workers=4).clean_data(df)
+    pd.testing.assert_frame_equal(sequential, threaded)
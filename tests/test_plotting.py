@@ -0,0 +1,69 @@
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+from questionnaire_reader.figures import FramePlotter
+from questionnaire_reader.plotting import get_histogram
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+@pytest.fixture
+def plotter() -> FramePlotter:
+    values = np.random.default_rng(0).normal(170, 10, size=500)
+    values[::50] = np.nan
+    group = np.where(np.arange(500) % 2, "a", "b")
+    yield FramePlotter(pd.DataFrame({"Height (cm)": values, "Sex": group}))
+    plt.close("all")
+
+
+def test_cumulative_histogram_matches_matplotlib():
+    values = np.random.default_rng(1).normal(size=200)
+    for cumulative in (True, -1):
+        for density in (False, True):
+            counts, edges = get_histogram(
+                values, 10, density=density, cumulative=cumulative
+            )
+            expected, expected_edges, _ = plt.hist(
+                values, bins=10, density=density, cumulative=cumulative
+            )
+            np.testing.assert_allclose(counts, expected)
+            np.testing.assert_allclose(edges, expected_edges)
+    plt.close("all")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"range": (0, 200)},
+        {"cumulative": True},
+        {"density": True, "alpha": 0.5},
+        {"weights": np.full(490, 2.0)},
+    ],
+)
+def test_binning_options_are_drawn_as_stairs(plotter, options):
+    axes = plotter.plot_column_distribution(
+        "Height (cm)", kde=False, **options
+    )
+    assert len(axes.patches) == 1
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"histtype": "step"}, {"log": True}, {"by": "Sex"}, {"rwidth": 0.5}],
+)
+def test_hist_options_fall_back_to_dataframe_hist(plotter, options):
+    plotter.plot_column_distribution("Height (cm)", kde=False, **options)
+
+
+def test_range_limits_bins(plotter):
+    axes = plotter.plot_column_distribution(
+        "Height (cm)", kde=False, n_bins=5, range=(160, 180)
+    )
+    (stairs,) = axes.patches
+    np.testing.assert_allclose(
+        stairs.get_data().edges, np.linspace(160, 180, 6)
+    )
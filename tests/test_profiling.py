@@ -0,0 +1,98 @@
+import tracemalloc
+
+import pytest
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.profiling import Profiler, StageProfile
+from questionnaire_reader.synthetic import generate_responses
+
+
+@pytest.fixture
+def not_tracing():
+    was_tracing = tracemalloc.is_tracing()
+    tracemalloc.stop()
+    yield
+    if was_tracing:
+        tracemalloc.start()
+
+
+def test_disabled_profiler_records_nothing(not_tracing):
+    records = []
+    profiler = Profiler(hook=records.append)
+    with profiler.stage("stage", rows=3) as counts:
+        assert not tracemalloc.is_tracing()
+    assert counts == {"rows": 3}
+    assert not profiler.profile
+    assert not records
+
+
+def test_hook_sees_each_stage(not_tracing):
+    records = []
+    profiler = Profiler(enabled=True, hook=records.append)
+    with profiler.stage("first", rows=2):
+        data = [0] * 100_000
+    with profiler.stage("second") as counts:
+        counts["rows"] = len(data)
+    assert records == list(profiler.profile)
+    assert [record.stage for record in records] == ["first", "second"]
+    assert [record.rows for record in records] == [2, 100_000]
+    assert all(isinstance(record, StageProfile) for record in records)
+    assert records[0].memory >= 100_000 * 8
+    assert all(record.seconds >= 0 for record in records)
+    assert not tracemalloc.is_tracing()
+
+
+def test_stage_is_recorded_when_it_raises(not_tracing):
+    profiler = Profiler(enabled=True)
+    with pytest.raises(ValueError):
+        with profiler.stage("failing"):
+            raise ValueError
+    assert [record.stage for record in profiler.profile] == ["failing"]
+    assert not tracemalloc.is_tracing()
+
+
+def test_existing_tracing_is_left_running(not_tracing):
+    tracemalloc.start()
+    try:
+        profiler = Profiler(enabled=True)
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                pass
+            assert tracemalloc.is_tracing()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert [record.stage for record in profiler.profile] == [
+        "inner",
+        "outer",
+    ]
+
+
+def test_nested_stages_stop_tracing_they_started(not_tracing):
+    profiler = Profiler(enabled=True)
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            pass
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_to_frame(not_tracing):
+    profiler = Profiler(enabled=True)
+    with profiler.stage("stage", rows=5):
+        pass
+    frame = profiler.profile.to_frame()
+    assert list(frame.columns) == list(StageProfile._fields)
+    assert frame.loc[0, "rows"] == 5
+
+
+def test_reader_profiles_each_stage(not_tracing):
+    records = []
+    reader = QuestionnaireReader(
+        path="unused.csv", profiling=True, profiling_hook=records.append
+    )
+    reader.clean_data(generate_responses(20))
+    stages = [record.stage for record in reader.profile]
+    assert records == list(reader.profile)
+    assert set(stages) >= {"replace_values", "bfi", "psqi", "shs"}
+    assert all(record.rows == 20 for record in records)
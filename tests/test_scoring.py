@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.bfi import calculate_bfi, calculate_bfi_scores
+from questionnaire_reader.psqi import REPLACE_DICT as PSQI_REPLACE_DICT
+from questionnaire_reader.psqi import (
+    calculate_component_2,
+    calculate_component_5,
+    calculate_component_4,
+    calculate_component_7,
+    convert_df,
+)
+from questionnaire_reader.synthetic import generate_responses
+
+N_ROWS = 200
+
+
+def with_index(df: pd.DataFrame, kind: str) -> pd.DataFrame:
+    df = df.copy()
+    if kind == "string":
+        df.index = [f"subject-{i}" for i in range(len(df))]
+    elif kind == "multi":
+        df.index = pd.MultiIndex.from_arrays(
+            [np.arange(len(df)) % 3, [f"s{i}" for i in range(len(df))]]
+        )
+    return df
+
+
+def convert_df_row_loop(psqi_df: pd.DataFrame) -> pd.DataFrame:
+    # The row-by-row binning convert_df replaced.
+    psqi_df = psqi_df.replace(PSQI_REPLACE_DICT)
+    for ind_name in psqi_df.index:
+        q2 = psqi_df.loc[ind_name, "Q_2"]
+        q4 = psqi_df.loc[ind_name, "Q_4"]
+        if q2 <= 15:
+            psqi_df.loc[ind_name, "Q_2"] = 0
+        elif q2 <= 30:
+            psqi_df.loc[ind_name, "Q_2"] = 1
+        elif q2 <= 60:
+            psqi_df.loc[ind_name, "Q_2"] = 2
+        else:
+            psqi_df.loc[ind_name, "Q_2"] = 3
+        if q4 > 7:
+            psqi_df.loc[ind_name, "Q_4"] = 0
+        elif q4 >= 6:
+            psqi_df.loc[ind_name, "Q_4"] = 1
+        elif q4 >= 5:
+            psqi_df.loc[ind_name, "Q_4"] = 2
+        else:
+            psqi_df.loc[ind_name, "Q_4"] = 3
+    return psqi_df
+
+
+# The ladders components 2, 5 and 7 were binned with, one score at a time.
+def component_2_ladder(score: float) -> float:
+    if score >= 1:
+        if score <= 2:
+            return 1
+        if score <= 4:
+            return 2
+        return 3
+    return score
+
+
+def component_5_ladder(score: float) -> float:
+    if score < 1:
+        return 0
+    if score <= 9:
+        return 1
+    if score <= 18:
+        return 2
+    return 3
+
+
+def component_7_ladder(score: float) -> float:
+    if score < 1:
+        return 0
+    if score <= 2:
+        return 1
+    if score <= 4:
+        return 2
+    return 3
+
+
+@pytest.fixture(scope="module")
+def raw() -> pd.DataFrame:
+    return generate_responses(
+        N_ROWS, seed=11, missing_rate=0.15, invalid_rate=0.05
+    )
+
+
+@pytest.fixture(scope="module")
+def reader() -> QuestionnaireReader:
+    return QuestionnaireReader(path="unused.csv")
+
+
+@pytest.mark.parametrize("kind", ["range", "string", "multi"])
+def test_bfi_scores_match_row_wise_scoring(raw, reader, kind):
+    responses = with_index(reader.get_bfi_responses(raw), kind)
+    assert responses.isna().any().any()
+    expected = responses.apply(calculate_bfi, axis=1).astype(float)
+    scores = calculate_bfi_scores(responses)
+    pd.testing.assert_frame_equal(scores, expected)
+
+
+@pytest.fixture(scope="module")
+def psqi(raw, reader) -> pd.DataFrame:
+    psqi = reader.get_psqi_responses(raw)
+    psqi["Q_2"] = psqi["Q_2"].astype(float)
+    # Edges of every bin, and missing answers, which fall in the last one.
+    latencies = [0, 15, 16, 30, 31, 60, 61, np.nan]
+    durations = [8, 7.5, 7, 6, 5.5, 5, 4.5, np.nan]
+    psqi.loc[: len(latencies) - 1, "Q_2"] = latencies
+    psqi.loc[: len(durations) - 1, "Q_4"] = durations
+    return psqi
+
+
+@pytest.mark.parametrize("kind", ["range", "string", "multi"])
+def test_convert_df_matches_row_loop(psqi, kind):
+    psqi = with_index(psqi, kind)
+    expected = convert_df_row_loop(psqi)
+    converted = convert_df(psqi)
+    pd.testing.assert_frame_equal(converted, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("kind", ["range", "string", "multi"])
+def test_components_match_ladders(psqi, kind):
+    psqi = convert_df(with_index(psqi, kind))
+    frequencies = psqi[[f"Q_5{letter}" for letter in "abcdefghi"]]
+    onset = psqi["Q_2"] + psqi["Q_5a"]
+    disturbances = frequencies.sum(axis=1)
+    dysfunction = psqi[["Q_8", "Q_9"]].sum(axis=1)
+    assert onset.isna().any()
+    for component, scores, ladder in [
+        (calculate_component_2(onset), onset, component_2_ladder),
+        (calculate_component_5(frequencies), disturbances, component_5_ladder),
+        (
+            calculate_component_7(psqi[["Q_8", "Q_9"]]),
+            dysfunction,
+            component_7_ladder,
+        ),
+    ]:
+        expected = scores.map(ladder)
+        pd.testing.assert_series_equal(component, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize(
+    "calculate,ladder,n_scores",
+    [
+        (calculate_component_2, component_2_ladder, 7),
+        (calculate_component_7, component_7_ladder, 7),
+        (calculate_component_5, component_5_ladder, 28),
+    ],
+)
+def test_components_match_ladders_on_every_score(calculate, ladder, n_scores):
+    scores = pd.Series(
+        np.arange(n_scores, dtype=float),
+        index=[f"score-{i}" for i in range(n_scores)],
+    )
+    if calculate is calculate_component_2:
+        component = calculate(scores)
+    else:
+        component = calculate(scores.to_frame())
+    expected = scores.map(ladder)
+    pd.testing.assert_series_equal(component, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize(
+    "bedtime,wakeup,hours,expected",
+    [
+        # 7 of 7.5 hours in bed (93%) and 5 of them (67%).
+        ("11:30:00 PM", "07:00:00 AM", 7, 0),
+        ("11:30:00 PM", "07:00:00 AM", 5, 2),
+        ("11:30 PM", "07:00 AM", 6, 1),
+        ("23:30:00", "07:00:00", 7, 0),
+        ("23:30", "07:00", 5, 2),
+        # Wrapping past midnight: 3 of 4 hours (75%) and 2 of them (50%).
+        ("10:00:00 PM", "02:00:00 AM", 3, 1),
+        ("10:00:00 PM", "02:00:00 AM", 2, 3),
+        # Going to bed after midnight.
+        ("01:00:00 AM", "09:00:00 AM", 8, 0),
+    ],
+)
+def test_component_4(bedtime, wakeup, hours, expected):
+    scores = pd.DataFrame({"Q_4": [hours], "Q_3": [wakeup], "Q_1": [bedtime]})
+    component, invalid = calculate_component_4(scores)
+    assert component.iloc[0] == expected
+    assert not invalid.iloc[0]
+
+
+@pytest.mark.parametrize(
+    "bedtime,wakeup,hours",
+    [
+        # No time in bed.
+        ("11:00:00 PM", "11:00:00 PM", 7),
+        ("11:00:00 PM", "soon", 7),
+        ("late", "07:00:00 AM", 7),
+        (np.nan, "07:00:00 AM", 7),
+        ("11:00:00 PM", "07:00:00 AM", np.nan),
+        ("11:00:00 PM", "07:00:00 AM", "a few"),
+    ],
+)
+def test_component_4_invalid(bedtime, wakeup, hours):
+    scores = pd.DataFrame(
+        {"Q_4": [hours], "Q_3": [wakeup], "Q_1": [bedtime]},
+        index=["subject"],
+    )
+    component, invalid = calculate_component_4(scores)
+    assert np.isnan(component["subject"])
+    assert invalid["subject"]
+
+
+def test_invalid_sleep_times(raw, reader):
+    raw = with_index(raw, "string")
+    bedtime, _, wakeup, _ = reader.schema.instrument_names["psqi"][:4]
+    raw.loc["subject-1", bedtime] = "late"
+    raw.loc["subject-3", wakeup] = raw.loc["subject-3", bedtime]
+    scores = reader.get_psqi_scores(raw)
+    invalid = reader.invalid_sleep_times
+    assert invalid.index.equals(raw.index)
+    assert list(invalid[invalid].index) == ["subject-1", "subject-3"]
+    assert scores.notna().all()
+
+
+def test_psqi_scores_are_numeric(raw, reader):
+    scores = reader.get_psqi_scores(raw)
+    assert scores.dtype == float
+    compact = QuestionnaireReader(path="unused.csv", compact=True)
+    data = compact.clean_data(raw)
+    assert data["PSQI"].dtype == np.int8
+    pd.testing.assert_series_equal(
+        data["PSQI"], scores, check_dtype=False, check_names=False
+    )
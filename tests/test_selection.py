@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.synthetic import write_export
+
+
+@pytest.fixture(scope="module")
+def export(tmp_path_factory) -> str:
+    path = tmp_path_factory.mktemp("exports") / "export.csv"
+    write_export(str(path), 30)
+    return str(path)
+
+
+def test_selected_instrument_matches_full_data(export):
+    full = QuestionnaireReader(export).data
+    reader = QuestionnaireReader(export, instruments=["psqi"])
+    pd.testing.assert_series_equal(reader.psqi_scores, full["PSQI"])
+
+
+@pytest.mark.parametrize(
+    "attribute,instrument", [("bfi_scores", "bfi"), ("shs_scores", "shs")]
+)
+def test_unselected_instrument_is_named(export, attribute, instrument):
+    reader = QuestionnaireReader(export, instruments=["psqi"])
+    with pytest.raises(ValueError, match=f"'{instrument}' instrument"):
+        getattr(reader, attribute)
+
+
+def test_names_only_selection_rejects_scores(export):
+    reader = QuestionnaireReader(export, names=["Sex"])
+    with pytest.raises(ValueError, match="'bfi' instrument was not selected"):
+        reader.bfi_scores
+
+
+def test_unselected_column_is_rejected(export):
+    reader = QuestionnaireReader(export, instruments=["shs"])
+    with pytest.raises(ValueError, match="Unavailable columns"):
+        reader.get_column("Sex")
+
+
+def test_get_column_matches_full_data(export):
+    full = QuestionnaireReader(export).data
+    reader = QuestionnaireReader(export)
+    for name in ("Sex", "Height (cm)", "Attention Deficit Disorder", "SHS"):
+        pd.testing.assert_series_equal(reader.get_column(name), full[name])
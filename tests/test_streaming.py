@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.synthetic import write_export
+from questionnaire_reader.writers import write_chunks
+
+N_ROWS = 120
+
+
+@pytest.fixture(scope="module")
+def exports(tmp_path_factory) -> dict:
+    directory = tmp_path_factory.mktemp("exports")
+    paths = {}
+    for extension in ("csv", "xlsx", "parquet"):
+        paths[extension] = str(directory / f"export.{extension}")
+        write_export(paths[extension], N_ROWS)
+    return paths
+
+
+def read_scores(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, keep_default_na=False, na_values=[""])
+
+
+@pytest.mark.parametrize("source", ["csv", "xlsx", "parquet"])
+@pytest.mark.parametrize("out", ["scores.csv", "scores.parquet"])
+def test_score_stream_matches_batch(exports, tmp_path, source, out):
+    reader = QuestionnaireReader(exports[source])
+    out = str(tmp_path / out)
+    assert reader.score_stream(None, out, chunksize=50) == N_ROWS
+    scores = read_scores(out)
+    data = QuestionnaireReader(exports[source]).data
+    assert list(scores.columns) == list(data.columns)
+    for name in ("PSQI", "SHS", "Agreeableness", "Height (cm)"):
+        pd.testing.assert_series_equal(
+            scores[name].astype(float),
+            data[name].astype(float),
+            check_index=False,
+        )
+    assert scores["Sex"].tolist() == data["Sex"].tolist()
+
+
+def test_text_after_empty_first_chunk(tmp_path):
+    chunks = [
+        pd.DataFrame({"Comments": [np.nan, np.nan], "Score": [1, 2]}),
+        pd.DataFrame({"Comments": ["asthma", np.nan], "Score": [3.5, 4]}),
+    ]
+    path = str(tmp_path / "scores.parquet")
+    write_chunks(path, iter(chunks), promote=True)
+    written = pd.read_parquet(path)
+    assert written["Comments"].tolist()[2] == "asthma"
+    assert written["Score"].tolist() == [1, 2, 3.5, 4]
+
+
+def test_failed_write_removes_output(tmp_path):
+    chunks = [
+        pd.DataFrame({"Weight": [60.5, 70]}),
+        pd.DataFrame({"Weight": ["heavy", "light"]}),
+    ]
+    path = tmp_path / "scores.parquet"
+    with pytest.raises(ValueError, match="changed from numbers to text"):
+        write_chunks(str(path), iter(chunks), promote=True)
+    assert not path.exists()
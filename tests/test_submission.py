@@ -0,0 +1,68 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from questionnaire_reader import QuestionnaireReader
+from questionnaire_reader.submission import score_submission
+from questionnaire_reader.synthetic import generate_responses, write_export
+
+
+def is_missing(value) -> bool:
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def assert_same(name: str, value, expected):
+    if is_missing(expected):
+        assert is_missing(value), name
+    elif isinstance(expected, (float, np.floating)):
+        assert math.isclose(value, expected, abs_tol=1e-9), name
+    else:
+        assert value == expected, name
+
+
+def assert_matches_batch(raw: pd.DataFrame):
+    reader = QuestionnaireReader(path="unused.csv")
+    clean = reader.clean_data(raw)
+    rows = clean.to_dict("records")
+    for record, row in zip(raw.to_dict("records"), rows):
+        result = score_submission(record)
+        assert list(result) == list(clean.columns)
+        for name, value in result.items():
+            assert_same(name, value, row[name])
+
+
+@pytest.mark.parametrize(
+    "missing_rate,invalid_rate", [(0, 0), (0.2, 0), (0.1, 0.1), (0.6, 0.05)]
+)
+def test_synthetic_records_match_batch(missing_rate, invalid_rate):
+    raw = generate_responses(
+        100, seed=3, missing_rate=missing_rate, invalid_rate=invalid_rate
+    )
+    assert_matches_batch(raw)
+
+
+@pytest.mark.parametrize("extension", ["csv", "xlsx"])
+def test_exported_records_match_batch(tmp_path, extension):
+    path = str(tmp_path / f"export.{extension}")
+    write_export(path, 100, missing_rate=0.1, invalid_rate=0.05)
+    assert_matches_batch(QuestionnaireReader(path).raw)
+
+
+def test_unknown_instrument_response_is_rejected():
+    record = generate_responses(1).to_dict("records")[0]
+    name = next(name for name in record if name.startswith("BFI"))
+    record[name] = "not an answer"
+    with pytest.raises(ValueError, match="Unknown response"):
+        score_submission(record)
+
+
+def test_missing_keys_are_missing_responses():
+    result = score_submission({})
+    assert result["Sex"] == "N/A"
+    assert math.isnan(result["Agreeableness"])
+    assert math.isnan(result["SHS"])
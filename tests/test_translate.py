@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from questionnaire_reader.defaults import REPLACE_DICT
+from questionnaire_reader.utils.translate import translate
+
+MAPPING = REPLACE_DICT["Sexual Orientation"]
+
+
+def test_translate():
+    responses = pd.Series(
+        [
+            "הטרוסקסואל",
+            "Bisexual",
+            "לא ידוע",
+            np.nan,
+            "מעדיף לא לענות",
+            "סטרייט",
+            "לא ידוע",
+            None,
+            "other",
+        ]
+    )
+    translated, unseen = translate(responses, MAPPING)
+    assert list(translated) == [
+        "Heterosexual",
+        "Bisexual",
+        "N/A",
+        "N/A",
+        None,
+        "Heterosexual",
+        "N/A",
+        "N/A",
+        "N/A",
+    ]
+    # Missing responses are not counted as unseen ones.
+    assert unseen.to_dict() == {"לא ידוע": 2, "other": 1}
+
+
+def test_translate_default():
+    responses = pd.Series(["ביסקסואל", "unknown"], index=["a", "b"])
+    translated, unseen = translate(responses, MAPPING, default="?")
+    assert list(translated) == ["Bisexual", "?"]
+    assert unseen.to_dict() == {"unknown": 1}
+
+
+def test_translate_without_unseen_responses():
+    responses = pd.Series(["אסקסואל", "Asexual"], dtype=object)
+    translated, unseen = translate(responses, MAPPING)
+    assert list(translated) == ["Asexual", "Asexual"]
+    assert unseen.empty
+
+
+def test_translate_empty():
+    translated, unseen = translate(pd.Series([], dtype=object), MAPPING)
+    assert len(translated) == 0
+    assert unseen.empty